@@ -0,0 +1,28 @@
+import pytest
+from utils.config_manager import ConfigManager
+
+
+@pytest.fixture
+def cm(tmp_path):
+    """ConfigManager backed by a per-test config file under tmp_path."""
+    return ConfigManager(str(tmp_path / 'test_config.json'))
+
+
+@pytest.fixture(scope="session")
+def api():
+    """Import api_server lazily and return (client, sender, config).
+
+    Only workers that actually run API tests pay for the FastAPI/sacn import.
+    """
+    from fastapi.testclient import TestClient
+    from api_server import app, sender, config
+    return TestClient(app), sender, config
+
+
+@pytest.fixture
+def reset_sender(api):
+    """Stop the shared api_server sender after each test that drives it."""
+    sender = api[1]
+    yield sender
+    if sender.is_running:
+        sender.stop_sending()
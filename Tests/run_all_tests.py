@@ -4,62 +4,137 @@ import os
 import shutil
 import time
 import socket
+import io
+import threading
+import asyncio
+import codecs
+import contextvars
+import functools
+import argparse
+
+# pytest's exit status for "no tests collected"
+NO_TESTS_COLLECTED = 5
+# Playwright exits 1 with this message when it finds no tests, so it has to
+# be spotted in the output instead
+PLAYWRIGHT_NO_TESTS = b'No tests found'
+
+_TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+with os.scandir(_TESTS_DIR) as _it:
+    _TEST_FILES = tuple(e.name for e in _it if e.name.startswith('test_') and e.name.endswith('.py'))
+
+@functools.lru_cache(maxsize=None)
+def _which(cmd):
+    """Resolve a Node CLI once per process; PATH walks are slow on Windows."""
+    if os.name != 'nt':
+        return cmd
+    return shutil.which(cmd) or cmd + '.cmd'
 
 def wait_for_port(host, port, timeout=10):
     print(f"[DEBUG] Waiting for port {host}:{port} to become available (timeout={timeout}s)...")
-    start = time.time()
-    while time.time() - start < timeout:
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        # Let the kernel wake us as soon as the connect completes; a closed
+        # port is refused immediately, so only that case needs a short nap.
         try:
-            with socket.create_connection((host, port), timeout=1):
+            with socket.create_connection((host, port), timeout=min(1.0, remaining)):
                 print(f"[DEBUG] Port {host}:{port} is now available.")
                 return True
-        except Exception:
-            time.sleep(0.5)
+        except socket.timeout:
+            continue
+        except OSError:
+            time.sleep(min(0.05, max(0, deadline - time.monotonic())))
     print(f"[DEBUG] Timeout waiting for port {host}:{port}.")
     return False
 
 def is_port_in_use(host, port):
     print(f"[DEBUG] Checking if port {host}:{port} is in use...")
     try:
-        with socket.create_connection((host, port), timeout=1):
+        # Local connects succeed or are refused almost instantly
+        with socket.create_connection((host, port), timeout=0.1):
             print(f"[DEBUG] Port {host}:{port} is in use.")
             return True
     except Exception:
         print(f"[DEBUG] Port {host}:{port} is NOT in use.")
         return False
 
-def run_pytest():
+async def run_streaming(argv, cwd, marker=None):
+    """Run argv, echoing its merged stdout/stderr as it arrives.
+
+    Output is read in chunks rather than lines, so one huge line (a long
+    assertion repr, say) can't overrun the stream reader's line limit.
+
+    Returns (exit code, whether marker appeared in the output).
+    """
+    proc = await asyncio.create_subprocess_exec(*argv, cwd=cwd, stdout=asyncio.subprocess.PIPE,
+                                                stderr=asyncio.subprocess.STDOUT)
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    seen = False
+    tail = b''  # End of the previous chunk, for markers split across chunks
+    while chunk := await proc.stdout.read(65536):
+        if marker is not None and not seen:
+            seen = marker in tail + chunk
+            tail = chunk[-(len(marker) - 1):] if len(marker) > 1 else b''
+        sys.stdout.write(decoder.decode(chunk))
+    sys.stdout.write(decoder.decode(b'', final=True))
+    return await proc.wait(), seen
+
+async def stop_process(proc, timeout=5):
+    """Terminate proc, escalating to kill if it does not exit within timeout."""
+    try:
+        proc.terminate()
+    except ProcessLookupError:
+        return  # Already exited
+    try:
+        await asyncio.wait_for(proc.wait(), timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+
+async def run_pytest():
     print("\n=== Running pytest for Python tests ===")
-    tests_dir = os.path.dirname(__file__)
-    test_files = [f for f in os.listdir(tests_dir) if f.startswith('test_') and f.endswith('.py')]
-    if not test_files:
+    if not _TEST_FILES:
         print("No Python test files found in Tests/.")
         return 0
-    print(f"[DEBUG] Running pytest on files: {test_files}")
-    result = subprocess.run([sys.executable, '-m', 'pytest'] + test_files, cwd=tests_dir, capture_output=True, text=True)
-    print(result.stdout)
-    if result.stderr:
-        print(result.stderr)
-    return result.returncode
-
-def run_playwright():
+    # Distribute across workers; loadfile keeps each module (and its shared
+    # api_server state) on a single worker. FC_TEST_JOBS pins the worker count.
+    jobs = os.environ.get('FC_TEST_JOBS', 'auto')
+    # Let pytest collect the directory itself (keeps its cache usable for
+    # --lf/--ff) and run from the project root so `utils` is importable.
+    print(f"[DEBUG] Running pytest on {_TESTS_DIR} ({len(_TEST_FILES)} files, workers: {jobs})")
+    returncode, _ = await run_streaming([sys.executable, '-m', 'pytest', '-n', jobs, '--dist', 'loadfile', _TESTS_DIR],
+                                        cwd=os.path.dirname(_TESTS_DIR))
+    if returncode == NO_TESTS_COLLECTED:
+        print("No Python tests were collected. Check your test file names.")
+    return returncode
+
+async def run_playwright():
     print("\n=== Running Playwright for frontend tests ===")
-    frontend_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'frontend'))
+    frontend_dir = os.path.join(os.path.dirname(_TESTS_DIR), 'frontend')
     tests_dir = os.path.join(frontend_dir, 'tests')
     if not os.path.exists(tests_dir):
         print("No Playwright tests directory found.")
         return 0
-    npx_cmd = 'npx'
-    if os.name == 'nt':
-        npx_cmd = shutil.which('npx') or 'npx.cmd'
-    npm_cmd = 'npm'
-    if os.name == 'nt':
-        npm_cmd = shutil.which('npm') or 'npm.cmd'
+    npx_cmd = _which('npx')
+    npm_cmd = _which('npm')
     frontend_port = 5173
     frontend_hosts = ['127.0.0.1', 'localhost']
+    # Probe each distinct address once; localhost usually aliases 127.0.0.1
+    probe_addrs = {}
+    for host in frontend_hosts:
+        try:
+            probe_addrs.setdefault(socket.gethostbyname(host), host)
+        except OSError:
+            probe_addrs.setdefault(host, host)
     
     # Check if frontend is already running on any host
-    frontend_running = any(is_port_in_use(host, frontend_port) for host in frontend_hosts)
+    frontend_running = False
+    for host in probe_addrs.values():
+        if await asyncio.to_thread(is_port_in_use, host, frontend_port):
+            frontend_running = True
+            break
     frontend_process = None
     
     if frontend_running:
@@ -67,51 +142,132 @@ def run_playwright():
     else:
         print(f"[DEBUG] Frontend not running. Starting frontend development server...")
         try:
-            frontend_process = subprocess.Popen([npm_cmd, 'run', 'dev'], cwd=frontend_dir, 
-                                              stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            # Nothing drains the dev server's output; a PIPE would fill up and
+            # stall Vite mid-run, so discard it.
+            frontend_process = await asyncio.create_subprocess_exec(npm_cmd, 'run', 'dev', cwd=frontend_dir,
+                                                                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
             # Wait for frontend to start
-            if not wait_for_port('localhost', frontend_port, timeout=30):
+            if not await asyncio.to_thread(wait_for_port, 'localhost', frontend_port, timeout=30):
                 print(f"[ERROR] Frontend failed to start within 30 seconds.")
-                if frontend_process:
-                    frontend_process.terminate()
+                await stop_process(frontend_process)
                 return 1
             print(f"[DEBUG] Frontend started successfully on port {frontend_port}.")
         except Exception as e:
             print(f"[ERROR] Failed to start frontend: {e}")
             if frontend_process:
-                frontend_process.terminate()
+                await stop_process(frontend_process)
             return 1
     
     try:
         print(f"[DEBUG] Running Playwright tests against frontend...")
-        result = subprocess.run([
-            npx_cmd, 'playwright', 'test', 'tests/'
-        ], cwd=frontend_dir, capture_output=True, text=True)
-        print(result.stdout)
-        if result.stderr:
-            print(result.stderr)
-        if 'No tests found' in result.stdout or 'No tests found' in result.stderr:
+        returncode, no_tests = await run_streaming([npx_cmd, 'playwright', 'test', 'tests/'], cwd=frontend_dir,
+                                                   marker=PLAYWRIGHT_NO_TESTS)
+        if no_tests:
             print("No Playwright tests were found or executed. Check your test file names and config.")
         print(f"[DEBUG] Playwright tests finished.")
-        return result.returncode
+        return returncode
     finally:
         # Clean up frontend process if we started it
         if frontend_process:
             print(f"[DEBUG] Terminating frontend process...")
-            frontend_process.terminate()
-            try:
-                frontend_process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                frontend_process.kill()
+            await stop_process(frontend_process)
             print(f"[DEBUG] Frontend process terminated.")
 
+_suite_tag = contextvars.ContextVar('suite_tag', default=None)
+
+class _TaggedStdout(io.TextIOBase):
+    """Prefix lines written within a tagged suite context and emit them whole."""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def write(self, text):
+        tag = _suite_tag.get()
+        if tag is None:
+            return self._stream.write(text)
+        with self._lock:
+            *lines, self._pending[tag] = (self._pending.get(tag, '') + text).split('\n')
+            if lines:
+                self._stream.write(''.join(f"[{tag}] {line}\n" for line in lines))
+                self._stream.flush()
+        return len(text)
+
+    def flush(self):
+        self._stream.flush()
+
+    async def run_tagged(self, tag, coro):
+        # Tasks and to_thread workers inherit the context, so the tag follows
+        # every print made on behalf of this suite.
+        _suite_tag.set(tag)
+        try:
+            return await coro
+        finally:
+            rest = self._pending.pop(tag, '')
+            if rest:
+                self._stream.write(f"[{tag}] {rest}\n")
+
+# Backend code the end-to-end Playwright suite drives through the real API
+_BACKEND_PATHS = ('api_server.py', 'requirements.txt', 'utils/')
+
+def _domains_for(name):
+    if name.startswith('frontend/'):
+        return {'fe'}
+    if name.startswith(_BACKEND_PATHS):
+        return {'py', 'fe'}
+    return {'py'}
+
+def changed_domains():
+    """Return which suites the working tree touches: {'py', 'fe'}.
+
+    Files under frontend/ belong to the Playwright suite and backend files to
+    both suites (Playwright exercises the live API); everything else to
+    pytest. Paths are relative to the project root even when it is not the
+    repository root. Returns an empty set if git is unavailable.
+    """
+    root = os.path.dirname(_TESTS_DIR)
+    try:
+        out = subprocess.check_output(['git', 'diff', '--name-only', '--relative', 'HEAD'], cwd=root, text=True,
+                                      stderr=subprocess.DEVNULL)
+        out += subprocess.check_output(['git', 'ls-files', '--others', '--exclude-standard'], cwd=root,
+                                       text=True, stderr=subprocess.DEVNULL)
+    except (OSError, subprocess.CalledProcessError):
+        return set()
+    return set().union(*(_domains_for(name) for name in out.splitlines() if name))
+
+async def run_all(domains):
+    # Both suites use disjoint resources, so await them side by side on one
+    # event loop. Output is streamed live with a per-suite prefix.
+    stdout = _TaggedStdout(sys.stdout)
+    sys.stdout = stdout
+
+    async def skipped():
+        return 0
+
+    try:
+        return await asyncio.gather(
+            asyncio.create_task(stdout.run_tagged('pytest', run_pytest() if 'py' in domains else skipped())),
+            asyncio.create_task(stdout.run_tagged('playwright', run_playwright() if 'fe' in domains else skipped())),
+        )
+    finally:
+        sys.stdout = stdout._stream
+
 def main():
-    py_status = run_pytest()
-    pw_status = run_playwright()
+    parser = argparse.ArgumentParser(description="Run Frame Conductor Python and Playwright tests")
+    parser.add_argument("--all", action="store_true", help="Run both suites regardless of what changed")
+    args = parser.parse_args()
+
+    domains = {'py', 'fe'} if args.all else (changed_domains() or {'py', 'fe'})
+    for suite, domain in (('pytest', 'py'), ('Playwright', 'fe')):
+        if domain not in domains:
+            print(f"[DEBUG] Skipping {suite} suite: no related changes (use --all to force).")
+
+    py_status, pw_status = asyncio.run(run_all(domains))
     if py_status != 0 or pw_status != 0:
         print("\nSome tests failed.")
         sys.exit(1)
     print("\nAll tests passed.")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main() 
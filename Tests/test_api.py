@@ -1,9 +1,5 @@
-from fastapi.testclient import TestClient
-from api_server import app, sender, config
-
-client = TestClient(app)
-
-def test_save_config():
+def test_save_config(api):
+    client, sender, config = api
     payload = {"total_frames": 1234, "frame_rate": 25}
     resp = client.post("/api/config", json=payload)
     assert resp.status_code == 200
@@ -12,7 +8,8 @@ def test_save_config():
     assert config["total_frames"] == 1234
     assert config["frame_rate"] == 25
 
-def test_start_sender():
+def test_start_sender(api, reset_sender):
+    client, sender, config = api
     # Set config first
     client.post("/api/config", json={"total_frames": 10, "frame_rate": 15})
     resp = client.post("/api/start")
@@ -23,7 +20,8 @@ def test_start_sender():
     assert sender.target_frame == 10
     assert sender.frame_rate == 15
 
-def test_pause_and_resume_sender():
+def test_pause_and_resume_sender(api, reset_sender):
+    client, sender, config = api
     # Start first
     client.post("/api/config", json={"total_frames": 5, "frame_rate": 10})
     client.post("/api/start")
@@ -38,7 +36,8 @@ def test_pause_and_resume_sender():
     assert resp.json()["success"] is True
     assert not sender.is_paused
 
-def test_reset_sender():
+def test_reset_sender(api, reset_sender):
+    client, sender, config = api
     client.post("/api/config", json={"total_frames": 5, "frame_rate": 10})
     client.post("/api/start")
     resp = client.post("/api/reset")
@@ -46,4 +45,119 @@ def test_reset_sender():
     assert resp.json()["success"] is True
     assert not sender.is_running
     assert not sender.is_paused
-    assert sender.current_frame == 0 
\ No newline at end of file
+    assert sender.current_frame == 0
+
+def test_progress_broadcast_reaches_all_clients(api):
+    client, sender, config = api
+    from api_server import update_progress
+    with client.websocket_connect("/ws/progress") as ws1, client.websocket_connect("/ws/progress") as ws2:
+        for ws in (ws1, ws2):
+            assert "frame" in ws.receive_json()
+            assert ws.receive_json()["type"] == "config_update"
+        update_progress(7, 'Sending frames...')
+        for ws in (ws1, ws2):
+            msg = ws.receive_json()
+            assert msg["frame"] == 7
+            assert msg["status"] == 'Sending frames...'
+    update_progress(0, 'Ready')
+
+def test_get_config_reflects_update(api):
+    client, sender, config = api
+    client.post("/api/config", json={"total_frames": 321, "frame_rate": 24})
+    resp = client.get("/api/config")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/json"
+    assert resp.json()["total_frames"] == 321
+    assert resp.json()["frame_rate"] == 24
+
+def test_config_writes_are_debounced(api, tmp_path, monkeypatch):
+    import json
+    import time
+    import api_server
+    from fastapi.testclient import TestClient
+    config_file = tmp_path / 'config.json'
+    monkeypatch.setattr(api_server, 'CONFIG_FILE', str(config_file))
+    with TestClient(api_server.app) as client:
+        for total in (100, 101, 102):
+            client.post("/api/config", json={"total_frames": total})
+        assert not config_file.exists()  # Still inside the debounce window
+        time.sleep(api_server.CONFIG_SAVE_DELAY * 3)
+        assert json.loads(config_file.read_text())["total_frames"] == 102
+        client.post("/api/config", json={"total_frames": 103})
+    # Pending change is flushed on shutdown
+    assert json.loads(config_file.read_text())["total_frames"] == 103
+
+def test_cors_allows_local_frontend_origins_only(api):
+    client, sender, config = api
+    for origin in ("http://localhost:5173", "http://192.168.1.20:5173", "http://10.0.0.7:5173",
+                   "http://stage-pc:5173", "http://stage-pc.local:5173"):
+        ok = client.get("/api/config", headers={"Origin": origin})
+        assert ok.headers["access-control-allow-origin"] == origin
+        assert "access-control-allow-credentials" not in ok.headers
+    for origin in ("http://example.com", "http://evil.example:5173", "http://8.8.8.8:5173",
+                   "http://localhost:8080"):
+        other = client.get("/api/config", headers={"Origin": origin})
+        assert "access-control-allow-origin" not in other.headers
+
+def test_state_reports_available_actions(api, reset_sender):
+    client, sender, config = api
+    client.post("/api/reset")
+    assert client.get("/api/state").json()["available_actions"] == ["start"]
+    client.post("/api/config", json={"total_frames": 5, "frame_rate": 10})
+    client.post("/api/start")
+    resp = client.get("/api/state").json()
+    assert resp["state"] == "running"
+    assert resp["available_actions"] == ["pause", "reset"]
+    client.post("/api/pause")
+    resp = client.get("/api/state").json()
+    assert resp["state"] == "paused"
+    assert resp["available_actions"] == ["resume", "reset"]
+
+def test_local_ip_is_cached(api, monkeypatch):
+    client, sender, config = api
+    import api_server
+    # Restore the cached response after the forced refresh below
+    monkeypatch.setattr(api_server, '_local_ip', api_server._local_ip)
+    monkeypatch.setattr(api_server, '_local_ip_encoded', api_server._local_ip_encoded)
+    first = client.get("/api/local_ip").json()["ip"]
+    monkeypatch.setattr(api_server, 'detect_local_ip', lambda: '10.9.8.7')
+    assert client.get("/api/local_ip").json()["ip"] == first
+    monkeypatch.setattr(api_server, '_local_ip_checked_at', 0.0)
+    monkeypatch.setattr(api_server, 'LOCAL_IP_TTL', -1.0)
+    assert client.get("/api/local_ip").json()["ip"] == '10.9.8.7'
+
+def test_slow_client_skips_stale_progress(api):
+    import asyncio
+    from api_server import WebSocketClient
+
+    async def scenario():
+        sent = []
+        gate = asyncio.Event()
+
+        class SlowWebSocket:
+            async def send_text(self, text):
+                await gate.wait()
+                sent.append(text)
+
+        client = WebSocketClient(SlowWebSocket())
+        client.post('progress', '1')
+        await asyncio.sleep(0)  # Pump picks up '1' and blocks on the socket
+        client.post('progress', '2')
+        client.post('config', 'c')
+        client.post('progress', '3')
+        gate.set()
+        await asyncio.sleep(0.01)
+        client.close()
+        return sent
+
+    assert asyncio.run(scenario()) == ['1', '3', 'c']
+
+def test_config_update_is_broadcast(api):
+    client, sender, config = api
+    with client.websocket_connect("/ws/progress") as ws:
+        ws.receive_json()
+        ws.receive_json()
+        client.post("/api/config", json={"total_frames": 77})
+        msg = ws.receive_json()
+        assert msg["type"] == "config_update"
+        assert msg["config"]["total_frames"] == 77
@@ -1,54 +1,37 @@
-import os
 import json
-import pytest
-from utils.config_manager import ConfigManager
-
-CONFIG_FILE = 'test_config.json'
-
-def setup_function():
-    # Remove test config file before each test
-    if os.path.exists(CONFIG_FILE):
-        os.remove(CONFIG_FILE)
-
-def teardown_function():
-    # Clean up after each test
-    if os.path.exists(CONFIG_FILE):
-        os.remove(CONFIG_FILE)
+import os
+from unittest.mock import patch
 
-def test_loads_default_config_if_no_file():
-    cm = ConfigManager(CONFIG_FILE)
+def test_loads_default_config_if_no_file(cm):
     config = cm.load_config()
     assert config['total_frames'] == 1000
     assert config['frame_rate'] == 30
     assert config['universe'] == 999
     assert config['frame_length'] == 512
 
-def test_loads_config_from_file_with_all_fields():
+def test_loads_config_from_file_with_all_fields(cm):
     data = {
         'total_frames': 1234,
         'frame_rate': 60,
         'universe': 123,
         'frame_length': 256
     }
-    with open(CONFIG_FILE, 'w') as f:
+    with open(cm.config_file, 'w') as f:
         json.dump(data, f)
-    cm = ConfigManager(CONFIG_FILE)
     config = cm.load_config()
     assert config == data
 
-def test_loads_config_with_missing_fields_uses_defaults():
+def test_loads_config_with_missing_fields_uses_defaults(cm):
     data = {'total_frames': 42}
-    with open(CONFIG_FILE, 'w') as f:
+    with open(cm.config_file, 'w') as f:
         json.dump(data, f)
-    cm = ConfigManager(CONFIG_FILE)
     config = cm.load_config()
     assert config['total_frames'] == 42
     assert config['frame_rate'] == 30
     assert config['universe'] == 999
     assert config['frame_length'] == 512
 
-def test_saves_config_with_all_fields():
-    cm = ConfigManager(CONFIG_FILE)
+def test_saves_config_with_all_fields(cm):
     data = {
         'total_frames': 2222,
         'frame_rate': 25,
@@ -56,21 +39,43 @@ def test_saves_config_with_all_fields():
         'frame_length': 128
     }
     assert cm.save_config(data)
-    with open(CONFIG_FILE) as f:
+    with open(cm.config_file) as f:
         loaded = json.load(f)
     assert loaded == data
 
-def test_updates_config_when_value_changes():
-    cm = ConfigManager(CONFIG_FILE)
+def test_updates_config_when_value_changes(cm):
     data = cm.load_config()
     data['total_frames'] = 555
     cm.save_config(data)
     config2 = cm.load_config()
     assert config2['total_frames'] == 555
 
-def test_handles_invalid_config_file_gracefully():
-    with open(CONFIG_FILE, 'w') as f:
+def test_handles_invalid_config_file_gracefully(cm):
+    with open(cm.config_file, 'w') as f:
         f.write('{invalid json')
-    cm = ConfigManager(CONFIG_FILE)
     config = cm.load_config()
-    assert config['total_frames'] == 1000  # default 
\ No newline at end of file
+    assert config['total_frames'] == 1000  # default 
+
+def test_load_config_is_cached_until_file_changes(cm):
+    cm.save_config({'total_frames': 10})
+    first = cm.load_config()
+    first['total_frames'] = 99  # Mutating a result must not leak into the cache
+    assert cm.load_config()['total_frames'] == 10
+    assert cm._load_cached.cache_info().hits == 1
+    cm.save_config({'total_frames': 11})
+    assert cm.load_config()['total_frames'] == 11
+
+def test_save_config_skips_unchanged_content(cm):
+    data = {'total_frames': 7}
+    assert cm.save_config(data)
+    with patch('builtins.open', side_effect=AssertionError("unexpected write")):
+        assert cm.save_config(dict(data))
+    os.remove(cm.config_file)  # Changed behind our back, so it must be rewritten
+    assert cm.save_config(data)
+    assert cm.load_config()['total_frames'] == 7
+    assert not os.path.exists(cm.config_file + '.tmp')
+
+def test_validate_config_rejects_non_dict_input(cm):
+    assert cm.validate_config({'total_frames': 10, 'frame_rate': 30})
+    assert not cm.validate_config(None)
+    assert not cm.validate_config([('frame_rate', 30)])
@@ -1,18 +1,17 @@
+import importlib
+import sys
 import pytest
 from unittest.mock import patch, MagicMock
-from utils.config_manager import ConfigManager
-from utils.sacn_sender import SACNSender
+from utils import sacn_sender
 
-def test_invalid_frame_value():
-    cm = ConfigManager('test_config.json')
+def test_invalid_frame_value(cm):
     config = cm.load_config()
     config['total_frames'] = -1
     assert cm.save_config(config)
     loaded = cm.load_config()
     assert loaded['total_frames'] == -1  # App should handle this gracefully elsewhere
 
-def test_invalid_fps_value():
-    cm = ConfigManager('test_config.json')
+def test_invalid_fps_value(cm):
     config = cm.load_config()
     config['frame_rate'] = 0
     assert cm.save_config(config)
@@ -20,9 +19,16 @@ def test_invalid_fps_value():
     assert loaded['frame_rate'] == 0  # App should handle this gracefully elsewhere
 
 def test_missing_sacn_library(monkeypatch):
-    monkeypatch.setitem(__import__('sys').modules, 'sacn', None)
-    with patch('builtins.print') as mock_print:
-        sender = SACNSender()
-        assert not sender.is_sacn_available() or sender.is_sacn_available() is False
+    monkeypatch.setitem(sys.modules, 'sacn', None)
+    try:
+        with patch('builtins.print') as mock_print:
+            # Re-run the module's guarded import so it actually sees sacn missing
+            importlib.reload(sacn_sender)
+            sender = sacn_sender.SACNSender()
+            assert not sender.is_sacn_available()
+            assert not sender.start_sending(10, 30)
+    finally:
+        monkeypatch.undo()
+        importlib.reload(sacn_sender)
 
 # Network error handling would require integration or mock testing of the sender's _sender_loop 
\ No newline at end of file
@@ -15,5 +15,20 @@ def test_headless_starts_in_paused(monkeypatch):
     # For now, just check the initial state logic
     assert not mock_sender.is_running or mock_sender.is_paused
 
+def test_progress_bar_redraws_only_on_visible_change(monkeypatch, capsys):
+    from utils import headless_utils
+    monkeypatch.setattr(headless_utils, '_last_drawn', None)
+    draw = headless_utils.headless_progress_bar
+    draw(10, 1000, 'Sending frames...')
+    assert '(Frame 10/1000)' in capsys.readouterr().out
+    draw(15, 1000, 'Sending frames...')  # Same 1% step: skipped
+    assert capsys.readouterr().out == ''
+    draw(15, 1000, 'Sending frames...', bar_length=10)  # New bar length
+    assert '[>         ]' in capsys.readouterr().out
+    draw(15, 1000, 'Paused', bar_length=10)  # New status
+    assert 'Status: Paused' in capsys.readouterr().out
+    draw(15, 500, 'Paused', bar_length=10)  # New total
+    assert '(Frame 15/500)' in capsys.readouterr().out
+
 # Additional tests would require refactoring run_headless for testability
 # and/or using integration tests with subprocess and pexpect for CLI interaction 
\ No newline at end of file
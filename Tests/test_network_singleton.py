@@ -0,0 +1,66 @@
+import time
+from unittest.mock import MagicMock
+
+import orjson
+import pytest
+
+from utils.network_singleton import NetworkSingleton
+
+TEST_PORT = 19001  # Away from the real singleton port so a running app doesn't interfere
+
+def test_host_scope_allows_one_instance():
+    conflicts = []
+    first = NetworkSingleton(port=TEST_PORT, scope="host")
+    second = NetworkSingleton(port=TEST_PORT, scope="host", on_conflict_callback=conflicts.append)
+    try:
+        assert first.start()
+        assert first.is_active()
+        assert first.network_thread is None
+        assert not second.start()
+        assert conflicts == [second.instance_id]
+        first.stop()
+        assert second.start()  # Released as soon as the holder stops
+    finally:
+        first.stop()
+        second.stop()
+
+@pytest.mark.parametrize("message_type", ["instance_check", "instance_response", "heartbeat"])
+def test_encoded_messages_are_valid_json(message_type):
+    singleton = NetworkSingleton(port=TEST_PORT)
+    message = orjson.loads(singleton._encode_message(message_type))
+    assert message["type"] == message_type
+    assert message["instance_id"] == singleton.instance_id
+    assert abs(message["timestamp"] - time.time()) < 5
+
+@pytest.mark.parametrize("data", [
+    b'{"type": "instance_check", "instance_id": "other:9000:5173", "timestamp": 1.0}',
+    b'{"type":"instance_check","instance_id":"other:9000:5173","timestamp":1.0}',
+])
+def test_answers_instance_checks(data):
+    singleton = NetworkSingleton(port=TEST_PORT)
+    singleton.socket = MagicMock()
+    singleton._handle_message(data, ('10.0.0.5', TEST_PORT))
+    payload, address = singleton.socket.sendto.call_args.args
+    assert orjson.loads(payload)["type"] == "instance_response"
+    assert address == ('10.0.0.5', TEST_PORT)
+
+@pytest.mark.parametrize("data", [
+    b'[1, 2]', b'"instance_check"', b'42', b'{invalid json',
+    b'{"type": "heartbeat", "instance_id": "other:9000:5173", "timestamp": 1.0}',
+])
+def test_ignores_other_messages(data):
+    singleton = NetworkSingleton(port=TEST_PORT)
+    singleton.socket = MagicMock()
+    singleton._handle_message(data, ('10.0.0.5', TEST_PORT))
+    singleton.socket.sendto.assert_not_called()
+
+def test_stop_joins_network_thread_promptly():
+    singleton = NetworkSingleton(port=TEST_PORT + 1, timeout=0.1, heartbeat_interval=60)
+    if not singleton.start():
+        pytest.skip("multicast is not available on this host")
+    thread = singleton.network_thread
+    started = time.monotonic()
+    singleton.stop()
+    assert time.monotonic() - started < 0.5
+    assert not thread.is_alive()
+    assert not singleton.is_active()
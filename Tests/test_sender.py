@@ -1,3 +1,5 @@
+import sys
+import threading
 import pytest
 from unittest.mock import MagicMock, patch
 from utils.sacn_sender import SACNSender
@@ -11,13 +13,12 @@ def test_initializes_with_defaults():
 
 def test_encodes_frame_number_correctly():
     sender = SACNSender()
+    dmx_data = bytearray(512)
     for frame in [0, 1, 255, 256, 65535]:
-        msb = (frame >> 8) & 0xFF
-        lsb = frame & 0xFF
-        dmx_data = [0] * 512
-        dmx_data[0] = msb
-        dmx_data[1] = lsb
+        dmx_data[0] = (frame >> 8) & 0xFF
+        dmx_data[1] = frame & 0xFF
         assert ((dmx_data[0] << 8) | dmx_data[1]) == frame
+    assert dmx_data[2:] == bytes(510)
 
 def test_start_sending_sets_state(monkeypatch):
     sender = SACNSender()
@@ -54,20 +55,52 @@ def test_handles_invalid_universe(monkeypatch):
     monkeypatch.setattr(sender, '_initialize_sender_once', lambda: False)
     assert not sender.start_sending(100, 30)
 
-def test_frame_callback_called():
-    sender = SACNSender()
+def test_frame_callback_called(monkeypatch):
+    # Drive the real loop without opening a socket
+    output = MagicMock()
+    monkeypatch.setattr('utils.sacn_sender.RawE131Output', lambda *args, **kwargs: output)
+    sender = SACNSender(use_raw=True)
     called = []
+    done = threading.Event()
     def cb(frame):
         called.append(frame)
+        if frame == 2:
+            done.set()
     sender.set_frame_callback(cb)
+    assert sender.start_sending(target_frame=2, frame_rate=30)
+    try:
+        # Callbacks arrive from the dispatcher thread, in order
+        assert done.wait(timeout=2.0)
+    finally:
+        sender.stop_sending()
+    assert called == [0, 1, 2]
+    assert [c.args[0] for c in output.send_frame.call_args_list] == [0, 1, 2]
+
+def test_get_state_snapshot():
+    sender = SACNSender()
     sender.is_running = True
-    sender.is_paused = False
-    sender.target_frame = 2
-    sender.current_frame = 0
-    def fake_loop():
-        for i in range(3):
-            if sender.frame_callback:
-                sender.frame_callback(i)
-    sender._sender_loop = fake_loop
-    sender._sender_loop()
-    assert called == [0, 1, 2] 
\ No newline at end of file
+    sender.current_frame = 42
+    sender.pause()
+    assert sender.get_state() == (True, True, 42)
+    assert sender.get_status() == "Paused"
+    sender.sender = MagicMock()
+    sender.stop_sending()
+    assert sender.get_state() == (False, False, 0)
+
+def test_raw_e131_packet_matches_sacn_library():
+    sacn = pytest.importorskip('sacn')
+    from utils.sacn_sender import build_e131_data_packet
+    cid = bytes(range(16))
+    packet = build_e131_data_packet(cid, 'Frame Conductor', 999, 512)
+    expected = sacn.DataPacket(cid=tuple(cid), sourceName='Frame Conductor', universe=999, dmxData=(0,) * 512)
+    assert bytes(packet) == bytes(expected.getBytes())
+
+def test_sender_thread_restores_switch_interval_on_early_exit():
+    baseline = sys.getswitchinterval()
+    sender = SACNSender()
+    sender.sender = MagicMock()
+    sender.sender.__getitem__.side_effect = KeyError(1)  # Output lookup fails, loop returns early
+    assert sender.start_sending(10, 30)
+    sender.sender_thread.join(timeout=1.0)
+    assert not sender.sender_thread.is_alive()
+    assert sys.getswitchinterval() == baseline
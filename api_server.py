@@ -7,7 +7,7 @@ communication with the React frontend via HTTP APIs and WebSocket.
 
 Features:
 - RESTful API endpoints for configuration and control
-- WebSocket for real-time progress updates
+- WebSocket for real-time progress updates (pushed on change)
 - sACN frame transmission management
 - Configuration persistence with file-based storage
 - Multi-client WebSocket support for real-time synchronization
@@ -25,21 +25,25 @@ Configuration:
     (sacn_sender_config.json) that persists settings between sessions.
 
 Threading:
-    Uses threading.RLock for thread-safe configuration access and
-    asyncio for WebSocket communication and async operations.
+    Configuration is only touched from the event loop and is guarded by an
+    asyncio.Lock; file writes run in worker threads serialized by a
+    threading.Lock. asyncio is used for WebSocket communication and async
+    operations.
 """
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 import threading
 import asyncio
-import json
+import orjson
 import os
 from utils.sacn_sender import SACNSender
 import logging
-from typing import Dict, Any, Set
+from typing import Dict, Any, List, Set
 import socket
+import time
+from contextlib import asynccontextmanager
 
 # Configuration constants
 CONFIG_FILE = 'sacn_sender_config.json'
@@ -50,31 +54,86 @@ DEFAULT_CONFIG = {
     'frame_length': 512
 }
 
+# Delay before a configuration change is written to disk; updates arriving
+# within this window are coalesced into a single write
+CONFIG_SAVE_DELAY = 0.25
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Flush any configuration change still waiting on the debounce window."""
+    yield
+    if _config_dirty is not None and _config_dirty.is_set():
+        await save_config()
+
+
 # Initialize FastAPI application
 app = FastAPI(
     title="Frame Conductor API",
     description="Backend API for sACN frame transmission control",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
-# Configure CORS for development
+def detect_local_ip() -> str:
+    """
+    Detect the LAN IP address of this machine.
+    
+    Returns:
+        str: Local IP address, or '127.0.0.1' if detection fails
+    """
+    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        # doesn't have to be reachable
+        s.connect(('10.255.255.255', 1))
+        return s.getsockname()[0]
+    except Exception:
+        return '127.0.0.1'
+    finally:
+        s.close()
+
+
+# Configure CORS for the frontend dev server. The GUI calls the API on
+# whatever host name the browser used, which need not match any IP detected
+# here, so accept local-network hosts on the frontend port: loopback,
+# private and link-local IPv4 addresses, bare host names and mDNS (.local)
+# names. Public hosts are rejected. No cookies or auth are used, so
+# credentials are not allowed.
+# WebSocket scopes bypass CORSMiddleware entirely, so /ws/progress pays nothing.
+FRONTEND_PORT = 5173
+# The LAN IP is detected once and re-checked at most every LOCAL_IP_TTL
+# seconds by /api/local_ip rather than opening a socket per request
+LOCAL_IP_TTL = 60.0
+_local_ip: str = detect_local_ip()
+_local_ip_encoded: bytes = orjson.dumps({"ip": _local_ip})
+_local_ip_checked_at = time.monotonic()
+
+_LOCAL_HOST_PATTERN = (
+    r"localhost|\[::1\]|127(?:\.\d{1,3}){3}"
+    r"|10(?:\.\d{1,3}){3}|192\.168(?:\.\d{1,3}){2}|169\.254(?:\.\d{1,3}){2}"
+    r"|172\.(?:1[6-9]|2\d|3[01])(?:\.\d{1,3}){2}"
+    r"|[a-zA-Z0-9-]+|[a-zA-Z0-9.-]+\.local"
+)
+CORS_ORIGIN_REGEX = rf"^https?://(?:{_LOCAL_HOST_PATTERN}):{FRONTEND_PORT}$"
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, specify actual origins
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_origin_regex=CORS_ORIGIN_REGEX,
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type"],
 )
 
 # --- Global State ---
-config_lock = threading.RLock()
-ws_clients: Set[WebSocket] = set()
+config_lock = asyncio.Lock()  # Guards the in-memory config on the event loop
+_config_file_lock = threading.Lock()  # Serializes writes to CONFIG_FILE
+# Connected clients; replaced (never mutated) on connect/disconnect so
+# broadcasters can iterate the current list without copying it
+ws_clients: List["WebSocketClient"] = []
 
 # Load configuration from file or use defaults
 if os.path.exists(CONFIG_FILE):
     try:
-        with open(CONFIG_FILE) as f:
-            config = json.load(f)
+        with open(CONFIG_FILE, 'rb') as f:
+            config = orjson.loads(f.read())
     except Exception as e:
         logging.error(f"Error loading config file: {e}")
         config = DEFAULT_CONFIG.copy()
@@ -87,19 +146,48 @@ sender = SACNSender(
     frame_length=config.get('frame_length', 512)
 )
 
+# Total frames used for progress percentages; refreshed on config update
+_total_frames: int = config.get('total_frames', 1000)
+
+class ProgressState:
+    """
+    Progress shown to WebSocket clients.
+    
+    Uses __slots__ so the per-frame updates from the sender thread are plain
+    attribute stores rather than dict lookups; the JSON form is only built
+    when a message is actually broadcast.
+    """
+    
+    __slots__ = ('frame', 'total_frames', 'status', 'percent')
+    
+    def __init__(self, total_frames: int):
+        self.frame = 0
+        self.total_frames = total_frames
+        self.status = 'Ready'
+        self.percent = 0
+    
+    def to_json(self) -> str:
+        """Encode the state as the JSON text sent to clients."""
+        return orjson.dumps({
+            'frame': self.frame,
+            'total_frames': self.total_frames,
+            'status': self.status,
+            'percent': self.percent
+        }).decode()
+
+
 # State for WebSocket progress updates
-progress_state = {
-    'frame': 0,
-    'total_frames': config.get('total_frames', 1000),
-    'status': 'Ready',
-    'percent': 0
-}
+progress_state = ProgressState(config.get('total_frames', 1000))
+
+def _encode_config_message() -> str:
+    """Encode the config_update WebSocket message for the current config."""
+    return orjson.dumps({'type': 'config_update', 'config': config}).decode()
 
-# State for configuration updates
-config_state = {
-    'type': 'config_update',
-    'config': config.copy()
-}
+
+# Pre-encoded configuration for GET /api/config and for WebSocket config
+# updates; both are rebuilt once per configuration change
+_config_encoded: bytes = orjson.dumps(config)
+config_message: str = _encode_config_message()
 
 # --- Helper Functions ---
 logging.basicConfig(level=logging.INFO)
@@ -107,84 +195,197 @@ logging.info(f"Backend working directory: {os.getcwd()}")
 logging.info(f"Config file path: {os.path.abspath(CONFIG_FILE)}")
 
 
-def save_config() -> bool:
+def _save_config_sync(snapshot: Dict[str, Any]) -> bool:
     """
-    Save the current configuration to the JSON file.
+    Write a configuration snapshot to the JSON file.
     
-    This function saves the in-memory configuration to the config file
-    with proper error handling and file system synchronization.
+    The snapshot is written to a temporary file which then replaces the
+    config file, so a crash mid-write cannot leave a truncated config.
+    This is blocking file I/O, so async callers should run it in a worker
+    thread. Concurrent writers are serialized by _config_file_lock;
+    config_lock is never held while writing.
     
+    Args:
+        snapshot (Dict[str, Any]): Configuration to write
+        
     Returns:
         bool: True if save was successful, False otherwise
     """
-    with config_lock:
-        try:
-            with open(CONFIG_FILE, 'w') as f:
-                json.dump(config, f, indent=2)
+    tmp_file = CONFIG_FILE + '.tmp'
+    try:
+        with _config_file_lock:
+            with open(tmp_file, 'wb') as f:
+                f.write(orjson.dumps(snapshot, option=orjson.OPT_INDENT_2))
+                # Get the data onto disk before the rename, or a power loss
+                # could leave the renamed file empty
                 f.flush()
-                os.fsync(f.fileno())  # Ensure data is written to disk
-            logging.info(f"Configuration saved to {os.path.abspath(CONFIG_FILE)}")
-            return True
-        except Exception as e:
-            logging.error(f"Error saving configuration: {e}", exc_info=True)
-            return False
+                os.fsync(f.fileno())
+            # Atomic swap: readers see either the old or the new file, never a partial one
+            os.replace(tmp_file, CONFIG_FILE)
+        logging.info(f"Configuration saved to {os.path.abspath(CONFIG_FILE)}")
+        return True
+    except Exception as e:
+        logging.error(f"Error saving configuration: {e}", exc_info=True)
+        try:
+            os.remove(tmp_file)
+        except OSError:
+            pass
+        return False
+
+
+async def save_config() -> bool:
+    """
+    Save the current configuration to the JSON file.
+    
+    The configuration is copied under config_lock and written in a worker
+    thread, so neither the lock nor the event loop is held across the fsync.
+    
+    Returns:
+        bool: True if save was successful, False otherwise
+    """
+    async with config_lock:
+        snapshot = config.copy()
+    return await asyncio.to_thread(_save_config_sync, snapshot)
+
+
+_config_flusher_task: asyncio.Task | None = None
+_config_dirty: asyncio.Event | None = None
+
+
+async def config_flusher(dirty: asyncio.Event) -> None:
+    """
+    Persist configuration changes in the background.
+    
+    Waits for the configuration to be marked dirty, lets further updates
+    settle for CONFIG_SAVE_DELAY, then writes the file once in a worker
+    thread so the fsync never blocks the event loop.
+    
+    Args:
+        dirty (asyncio.Event): Set whenever the in-memory configuration changes
+    """
+    while True:
+        await dirty.wait()
+        await asyncio.sleep(CONFIG_SAVE_DELAY)
+        dirty.clear()
+        await save_config()
+
+
+def mark_config_dirty() -> None:
+    """Schedule a debounced save of the in-memory configuration."""
+    global _config_flusher_task, _config_dirty
+    if _config_flusher_task is None or _config_flusher_task.done():
+        # The event is created alongside the task so both belong to the running loop
+        _config_dirty = asyncio.Event()
+        _config_flusher_task = asyncio.create_task(config_flusher(_config_dirty))
+    _config_dirty.set()
 
 
 def update_progress(frame: int | None = None, status: str | None = None) -> None:
     """
     Update the progress state for WebSocket broadcasting.
     
-    This function updates the progress state that is continuously
-    broadcast to all connected WebSocket clients.
+    This function updates the progress state and, if anything actually
+    changed, wakes the progress broadcaster. It may be called from the
+    sender thread via the frame callback.
     
     Args:
         frame (int, optional): Current frame number
         status (str, optional): Current status ('Ready', 'Sending frames...', 'Paused', etc.)
     """
+    state = progress_state
+    previous = (state.frame, state.status, state.total_frames, state.percent)
+    
     if frame is not None:
-        progress_state['frame'] = frame
+        state.frame = frame
     if status is not None:
-        progress_state['status'] = status
+        state.status = status
     
-    # Update total frames from current config
-    progress_state['total_frames'] = config.get('total_frames', 1000)
+    # Update total frames from the cached config value
+    total_frames = _total_frames
+    state.total_frames = total_frames
     
-    # Calculate percentage
-    if progress_state['total_frames'] > 0:
-        progress_state['percent'] = int((progress_state['frame'] / progress_state['total_frames']) * 100)
+    # Calculate percentage with integer arithmetic
+    if total_frames > 0:
+        state.percent = (state.frame * 100) // total_frames
     else:
-        progress_state['percent'] = 0
+        state.percent = 0
+    
+    if previous != (state.frame, state.status, state.total_frames, state.percent):
+        request_broadcast('progress')
 
 
-async def broadcast_config_update() -> None:
+class WebSocketClient:
     """
-    Broadcast configuration updates to all connected WebSocket clients.
+    A connected WebSocket client with its own send pump.
     
-    This function sends the current configuration to all connected
-    WebSocket clients to keep them synchronized.
+    Messages are posted without awaiting the socket, so a slow client can
+    never stall the broadcasters or other clients. At most one message per
+    kind ('progress', 'config') is pending: a newer message replaces an
+    unsent older one, so a lagging client skips stale state instead of
+    buffering it.
     """
-    if ws_clients:
-        # Create a copy to avoid modification during iteration
-        clients = list(ws_clients)
-        for client in clients:
-            try:
-                await client.send_json(config_state)
-            except Exception:
-                # Remove disconnected clients
-                ws_clients.discard(client)
+    
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self._pending: Dict[str, str] = {}
+        self._ready = asyncio.Event()
+        self._pump_task = asyncio.create_task(self._pump())
+    
+    def post(self, kind: str, payload: str) -> None:
+        """Queue payload as the latest message of the given kind."""
+        self._pending[kind] = payload
+        self._ready.set()
+    
+    async def _pump(self) -> None:
+        try:
+            while True:
+                await self._ready.wait()
+                self._ready.clear()
+                while self._pending:
+                    kind = next(iter(self._pending))
+                    await self.websocket.send_text(self._pending.pop(kind))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # The endpoint notices the disconnect and unregisters the client
+            logging.info(f"WebSocket send failed: {e}")
+    
+    def close(self) -> None:
+        """Stop the send pump."""
+        self._pump_task.cancel()
+
+
+def _remove_ws_client(client: WebSocketClient) -> None:
+    """Drop a client by swapping in a new client list."""
+    global ws_clients
+    ws_clients = [c for c in ws_clients if c is not client]
+
+
+def post_to_all_clients(kind: str, payload: str) -> None:
+    """
+    Post one pre-encoded message to every connected WebSocket client.
+    
+    Args:
+        kind (str): Message kind; newer messages replace unsent ones of the same kind
+        payload (str): JSON text to send
+    """
+    for client in ws_clients:
+        client.post(kind, payload)
 
 
 # --- HTTP Endpoints ---
 @app.get("/api/config")
-async def get_config() -> Dict[str, Any]:
+async def get_config() -> Response:
     """
     Get the current configuration.
     
+    Serves the cached encoding of the in-memory configuration, which is only
+    rebuilt when the configuration changes.
+    
     Returns:
-        Dict[str, Any]: Current configuration including total_frames, frame_rate, universe, and frame_length
+        Response: JSON configuration including total_frames, frame_rate, universe, and frame_length
     """
-    with config_lock:
-        return config.copy()
+    return Response(content=_config_encoded, media_type="application/json")
 
 
 @app.post("/api/config")
@@ -194,7 +395,7 @@ async def update_config(request: Request) -> Dict[str, Any]:
     
     This endpoint accepts configuration updates and:
     1. Updates the in-memory configuration
-    2. Saves the configuration to file
+    2. Schedules a debounced save of the configuration file
     3. Updates the sACN sender settings
     4. Broadcasts the update to all WebSocket clients
     5. Stops the sender if it's currently running (to apply new settings)
@@ -205,6 +406,7 @@ async def update_config(request: Request) -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: Success status and optional error message
     """
+    global _config_encoded, config_message, _total_frames
     logging.info("Configuration update requested")
     try:
         data = await request.json()
@@ -212,30 +414,31 @@ async def update_config(request: Request) -> Dict[str, Any]:
         
         need_to_stop = False
         
-        with config_lock:
+        async with config_lock:
             # Update configuration
             config.update(data)
+            _config_encoded = orjson.dumps(config)
+            _total_frames = config.get('total_frames', 1000)
             logging.info(f"Configuration updated: {config}")
             
-            # Save to file
-            if not save_config():
-                return {"success": False, "error": "Failed to save configuration"}
+            # Save to file (debounced, off the request path)
+            mark_config_dirty()
             
             # Update sACN sender settings
             sender.universe = config.get('universe', 999)
             sender.frame_length = config.get('frame_length', 512)
             logging.info(f"sACN sender updated: universe={sender.universe}, frame_length={sender.frame_length}")
             
-            # Update config state for WebSocket broadcasting
-            config_state['config'] = config.copy()
-            
-            # Broadcast update to all clients
-            asyncio.create_task(broadcast_config_update())
+            # Encode the WebSocket config update once for all clients
+            config_message = _encode_config_message()
             
             # Stop sender if running to apply new settings
             if sender.is_running:
                 need_to_stop = True
         
+        # Broadcast update to all clients once the lock is released
+        request_broadcast('config')
+        
         # Stop sender outside of lock to avoid deadlock
         if need_to_stop:
             logging.info("Stopping sender to apply new configuration")
@@ -363,51 +566,131 @@ async def reset_sender() -> Dict[str, Any]:
 
 
 @app.get("/api/local_ip")
-def get_local_ip():
-    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    try:
-        # doesn't have to be reachable
-        s.connect(('10.255.255.255', 1))
-        IP = s.getsockname()[0]
-    except Exception:
-        IP = '127.0.0.1'
-    finally:
-        s.close()
-    return {"ip": IP}
+async def get_local_ip() -> Response:
+    """
+    Get the LAN IP address of the backend host.
+    
+    Returns:
+        Response: Pre-encoded JSON {"ip": ...}, re-detected at most every LOCAL_IP_TTL seconds
+    """
+    global _local_ip, _local_ip_encoded, _local_ip_checked_at
+    now = time.monotonic()
+    if now - _local_ip_checked_at > LOCAL_IP_TTL:
+        _local_ip = detect_local_ip()
+        _local_ip_encoded = orjson.dumps({"ip": _local_ip})
+        _local_ip_checked_at = now
+    return Response(content=_local_ip_encoded, media_type="application/json")
+
+
+# Sender state and available actions keyed by (is_running, is_paused)
+SENDER_STATE_TABLE = {
+    (False, False): ("stopped", ("start",)),
+    (False, True): ("stopped", ("start",)),
+    (True, False): ("running", ("pause", "reset")),
+    (True, True): ("paused", ("resume", "reset")),
+}
 
 
 @app.get("/api/state")
-async def get_sender_state() -> Dict[str, Any]:
+async def get_sender_state() -> Response:
     """
     Get the current state of the sACN sender.
     
+    The body is encoded directly with orjson, skipping FastAPI's generic
+    response serialization.
+    
     Returns:
-        Dict[str, Any]: Current state information including status and available actions
+        Response: Current state information including status and available actions
     """
     try:
-        if not sender.is_running:
-            state = "stopped"
-            available_actions = ["start"]
-        elif sender.is_paused:
-            state = "paused"
-            available_actions = ["resume", "reset"]
-        else:
-            state = "running"
-            available_actions = ["pause", "reset"]
+        is_running, is_paused, _ = sender.get_state()
+        state, available_actions = SENDER_STATE_TABLE[(is_running, is_paused)]
         
-        return {
+        body = {
             "state": state,
             "available_actions": available_actions,
-            "current_frame": progress_state.get('frame', 0),
-            "total_frames": progress_state.get('total_frames', 0)
+            "current_frame": progress_state.frame,
+            "total_frames": progress_state.total_frames,
+            "dropped_frames": sender.dropped_frames
         }
         
     except Exception as e:
         logging.error(f"Exception getting sender state: {e}", exc_info=True)
-        return {"state": "error", "available_actions": [], "error": str(e)}
+        body = {"state": "error", "available_actions": [], "error": str(e)}
+    
+    return Response(content=orjson.dumps(body), media_type="application/json")
 
 
 # --- WebSocket Endpoint ---
+_broadcaster_task: asyncio.Task | None = None
+_broadcast_requested: asyncio.Event | None = None
+_broadcaster_loop: asyncio.AbstractEventLoop | None = None
+_pending_broadcasts: Set[str] = set()
+
+
+async def ws_broadcaster(requested: asyncio.Event) -> None:
+    """
+    Broadcast state changes to all connected WebSocket clients.
+    
+    A single long-lived task serves every client and only sends when the
+    progress or configuration state has changed. Requests arriving within
+    ~16ms are coalesced into one message per kind, and each payload is
+    encoded once for all clients.
+    
+    Args:
+        requested (asyncio.Event): Set whenever a broadcast is requested
+    """
+    while True:
+        await requested.wait()
+        await asyncio.sleep(0.016)  # Coalesce bursts to at most ~60fps
+        requested.clear()
+        kinds = set()
+        while _pending_broadcasts:
+            kinds.add(_pending_broadcasts.pop())
+        if not ws_clients:
+            continue
+        if 'config' in kinds:
+            post_to_all_clients('config', config_message)
+        if 'progress' in kinds:
+            post_to_all_clients('progress', progress_state.to_json())
+
+
+def _ensure_broadcaster() -> None:
+    """Start the shared WebSocket broadcaster on the running loop if needed."""
+    global _broadcaster_task, _broadcast_requested, _broadcaster_loop
+    if _broadcaster_task is None or _broadcaster_task.done():
+        # The event is created alongside the task so both belong to the running loop
+        _broadcast_requested = asyncio.Event()
+        _broadcaster_loop = asyncio.get_running_loop()
+        # Requests pending for a previous loop will never be served; drop them
+        # so request_broadcast() doesn't keep waiting on a dead wake-up
+        _pending_broadcasts.clear()
+        _broadcaster_task = asyncio.create_task(ws_broadcaster(_broadcast_requested))
+
+
+def request_broadcast(kind: str) -> None:
+    """
+    Ask the broadcaster to push the latest state to all clients.
+    
+    Safe to call from any thread, including the sender thread.
+    
+    Args:
+        kind (str): 'progress' or 'config'
+    """
+    requested, loop = _broadcast_requested, _broadcaster_loop
+    if requested is None or loop is None:
+        return  # No client has connected yet
+    if kind in _pending_broadcasts:
+        # A wake-up is already on its way; the broadcaster takes the kind
+        # out before building messages, so it will still send the newest state
+        return
+    _pending_broadcasts.add(kind)
+    try:
+        loop.call_soon_threadsafe(requested.set)
+    except RuntimeError:
+        _pending_broadcasts.discard(kind)  # Loop already closed
+
+
 @app.websocket("/ws/progress")
 async def websocket_progress(websocket: WebSocket):
     """
@@ -416,30 +699,35 @@ async def websocket_progress(websocket: WebSocket):
     This endpoint:
     1. Accepts WebSocket connections
     2. Sends initial state (progress and config)
-    3. Continuously broadcasts progress updates at ~60fps
+    3. Registers the client with the shared broadcaster, which pushes
+       progress and config changes through the client's own send pump
     4. Handles client disconnections gracefully
     
     Args:
         websocket (WebSocket): WebSocket connection object
     """
+    global ws_clients
     await websocket.accept()
-    ws_clients.add(websocket)
-    logging.info(f"WebSocket client connected. Total clients: {len(ws_clients)}")
+    _ensure_broadcaster()
+    client = WebSocketClient(websocket)
     
     try:
-        # Send initial state
-        await websocket.send_json(progress_state)
-        await websocket.send_json(config_state)
+        # Queue initial state, then join the broadcast set
+        client.post('progress', progress_state.to_json())
+        client.post('config', config_message)
+        ws_clients = ws_clients + [client]
+        logging.info(f"WebSocket client connected. Total clients: {len(ws_clients)}")
         
-        # Keep connection alive with frequent updates for smooth visual feedback
-        while True:
-            await asyncio.sleep(0.016)  # ~60fps for smooth updates
-            await websocket.send_json(progress_state)
+        # Progress is pushed by the broadcaster; just wait for the client to leave
+        async for _ in websocket.iter_text():
+            pass
+        logging.info("WebSocket client disconnected")
             
     except WebSocketDisconnect:
         logging.info("WebSocket client disconnected")
     except Exception as e:
         logging.error(f"WebSocket error: {e}")
     finally:
-        ws_clients.discard(websocket)
-        logging.info(f"WebSocket client removed. Total clients: {len(ws_clients)}") 
\ No newline at end of file
+        _remove_ws_client(client)
+        client.close()
+        logging.info(f"WebSocket client removed. Total clients: {len(ws_clients)}")
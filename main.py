@@ -14,12 +14,15 @@ Features:
 - Network-wide singleton protection (only one instance per network)
 
 Usage:
-    python main.py [--headless] [--target-frame N] [--fps X]
+    python main.py [--headless] [--target-frame N] [--fps X] [--singleton-scope {network,host}]
+                   [--singleton-timeout S]
 
 Arguments:
     --headless: Run in headless mode (not implemented in current version)
     --target-frame N: Set total frames to send (default: 1000)
     --fps X: Set frame rate in frames per second (default: 30)
+    --singleton-scope: Allow one instance per network (default) or per host
+    --singleton-timeout S: Seconds to wait for other instances to answer (default: 2.0)
 
 Network Access:
     The application automatically detects your local IP address and provides
@@ -39,14 +42,27 @@ import webbrowser
 import os
 import socket
 import shutil
+import signal
+import threading
+import importlib.util
+import functools
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
 from utils.network_singleton import NetworkSingleton
 
 # Configuration constants
 BACKEND_PORT = 9000
 FRONTEND_PORT = 5173  # Default Vite dev server port
 FRONTEND_DEV = True  # Set to True to launch React dev server automatically
+SHUTDOWN_TIMEOUT = 5  # Seconds to wait for servers to exit before killing them
 
-
+# Run each server in its own process group so shutdown reaches its children too
+if os.name == 'nt':
+    PROCESS_GROUP_KWARGS = {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+else:
+    PROCESS_GROUP_KWARGS = {'start_new_session': True}
+# Servers never read from the console; don't hand them its input handle
+PROCESS_GROUP_KWARGS['stdin'] = subprocess.DEVNULL
 
 
 
@@ -59,12 +75,15 @@ def start_backend() -> subprocess.Popen:
         
     Note:
         The backend is configured to bind to all network interfaces (0.0.0.0)
-        to allow access from other devices on the network.
+        to allow access from other devices on the network. It runs on uvloop
+        when available (not supported on Windows), otherwise on asyncio.
     """
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
     return subprocess.Popen([
         sys.executable, "-m", "uvicorn", "api_server:app",
-        "--host", "0.0.0.0", "--port", str(BACKEND_PORT)
-    ])
+        "--host", "0.0.0.0", "--port", str(BACKEND_PORT),
+        "--loop", loop
+    ], **PROCESS_GROUP_KWARGS)
 
 
 def start_frontend() -> subprocess.Popen:
@@ -85,28 +104,68 @@ def start_frontend() -> subprocess.Popen:
         if not os.path.exists(npm_path):
             npm_path = "npm"  # Final fallback
     print(f"[DEBUG] Using npm path: {npm_path}")
-    return subprocess.Popen([npm_path, "run", "dev"], cwd="frontend")
+    return subprocess.Popen([npm_path, "run", "dev"], cwd="frontend", **PROCESS_GROUP_KWARGS)
 
 
-def check_port(host: str, port: int, timeout: int = 2) -> bool:
+def stop_processes(procs: list, timeout: float = SHUTDOWN_TIMEOUT) -> None:
+    """
+    Terminate server processes, killing any that do not exit in time.
+    
+    All processes are signalled before any is waited on, so they shut down
+    in parallel.
+    
+    Args:
+        procs (list): subprocess.Popen objects started by start_backend/start_frontend
+        timeout (float): Total seconds to wait before killing the remaining processes
+    """
+    def signal_group(proc: subprocess.Popen, kill: bool) -> None:
+        try:
+            if os.name == 'nt':
+                # CTRL_BREAK reaches the whole console process group, letting
+                # uvicorn/npm shut down their own children
+                proc.kill() if kill else proc.send_signal(signal.CTRL_BREAK_EVENT)
+            else:
+                # Signal the whole group so npm's node child exits as well
+                os.killpg(proc.pid, signal.SIGKILL if kill else signal.SIGTERM)
+        except (ProcessLookupError, PermissionError):
+            pass  # Already exited
+    
+    for proc in procs:
+        signal_group(proc, kill=False)
+    
+    deadline = time.monotonic() + timeout
+    for proc in procs:
+        try:
+            proc.wait(timeout=max(0, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            print(f"[WARNING] Process {proc.pid} did not exit, killing it")
+            signal_group(proc, kill=True)
+            proc.wait()
+
+
+def check_port(host: str, port: int, timeout: float = 0.5, attempts: int = 2) -> bool:
     """
     Check if a port is open and accepting connections.
     
     Args:
         host (str): Hostname or IP address to check
         port (int): Port number to check
-        timeout (int): Connection timeout in seconds
+        timeout (float): Connection timeout in seconds, per attempt
+        attempts (int): Number of connection attempts before giving up
         
     Returns:
         bool: True if port is open, False otherwise
     """
-    try:
-        with socket.create_connection((host, port), timeout=timeout):
-            return True
-    except:
-        return False
+    for _ in range(attempts):
+        try:
+            with socket.create_connection((host, port), timeout=timeout):
+                return True
+        except:
+            pass
+    return False
 
 
+@functools.lru_cache(maxsize=1)
 def get_local_ip() -> str:
     """
     Get the local IP address for network access.
@@ -114,6 +173,8 @@ def get_local_ip() -> str:
     This function determines the local IP address by attempting to connect
     to a remote address (8.8.8.8:80) and reading the local socket address.
     
+    The result is cached for the lifetime of the process.
+    
     Returns:
         str: Local IP address, or "localhost" if detection fails
     """
@@ -135,7 +196,7 @@ def main() -> int:
     2. Starts the network singleton mechanism
     3. Starts the backend FastAPI server
     4. Starts the frontend React development server (if enabled)
-    5. Waits for servers to start and verifies they're running
+    5. Waits until the servers accept connections (up to 5 seconds)
     6. Opens the web interface in the default browser
     7. Displays network access information
     8. Waits for user interruption (Ctrl+C)
@@ -149,81 +210,112 @@ def main() -> int:
     parser.add_argument("--target-frame", type=int, default=1000, help="Total frames (default: 1000)")
     parser.add_argument("--fps", type=int, default=30, help="Frame rate (default: 30)")
     parser.add_argument("--no-singleton", action="store_true", help="Disable network singleton protection")
+    parser.add_argument("--singleton-scope", choices=["network", "host"], default="network",
+                        help="Allow one instance per network (default) or per host")
+    parser.add_argument("--singleton-timeout", type=float, default=2.0,
+                        help="Seconds to wait for other instances to answer (default: 2.0)")
     args = parser.parse_args()
 
     # Initialize network singleton (unless disabled)
     singleton = None
     if not args.no_singleton:
         def on_conflict(instance_id: str):
-            print(f"[ERROR] Another Frame Conductor instance is already running on the network")
-            print(f"[ERROR] Only one instance is allowed per network")
+            print(f"[ERROR] Another Frame Conductor instance is already running on the {args.singleton_scope}")
+            print(f"[ERROR] Only one instance is allowed per {args.singleton_scope}")
         
-        singleton = NetworkSingleton(on_conflict_callback=on_conflict)
+        singleton = NetworkSingleton(on_conflict_callback=on_conflict, scope=args.singleton_scope,
+                                     timeout=args.singleton_timeout)
         if not singleton.start():
             return 1
     else:
         print("[WARNING] Network singleton protection disabled")
 
     try:
-        print(f"[DEBUG] Starting backend on port {BACKEND_PORT}...")
-        backend_proc = start_backend()
-        
-        frontend_proc = None
-        if FRONTEND_DEV:
-            print(f"[DEBUG] Starting frontend on port {FRONTEND_PORT}...")
-            frontend_proc = start_frontend()
-        
-        print("[DEBUG] Waiting for servers to start...")
-        time.sleep(3)  # Give servers more time to start
-        
-        # Check if servers are running
-        local_ip = get_local_ip()
-        backend_running = check_port(local_ip, BACKEND_PORT)
-        frontend_running = check_port(local_ip, FRONTEND_PORT)
-        
-        print(f"[DEBUG] Backend running: {backend_running}")
-        print(f"[DEBUG] Frontend running: {frontend_running}")
-        
-        if not backend_running:
-            print(f"[ERROR] Backend failed to start on port {BACKEND_PORT}")
-            return 1
-        
-        if not frontend_running:
-            print(f"[WARNING] Frontend may not be running on port {FRONTEND_PORT}")
-            print("[INFO] You may need to manually start the frontend with: cd frontend && npm run dev")
-
-        # Open the web GUI in the default browser
-        if frontend_running:
-            webbrowser.open(f"http://{local_ip}:{FRONTEND_PORT}")
-            print(f"Web GUI launched at http://{local_ip}:{FRONTEND_PORT}")
-            print(f"Other computers can access the GUI at: http://{local_ip}:{FRONTEND_PORT}")
-        else:
-            print(f"Backend API available at http://{local_ip}:{BACKEND_PORT}")
-            print(f"Other computers can access the API at: http://{local_ip}:{BACKEND_PORT}")
+        with contextlib.ExitStack() as stack:
+            # Exiting the stack (normally, on an early return or on an error)
+            # stops every server started so far, then closes its Popen handles
+            procs = []
+            
+            def shutdown_servers():
+                if not procs:
+                    return
+                print("[DEBUG] Terminating processes...")
+                stop_processes(procs)
+                print("All processes terminated. Goodbye!")
+            
+            try:
+                print(f"[DEBUG] Starting backend on port {BACKEND_PORT}...")
+                procs.append(stack.enter_context(start_backend()))
+                
+                if FRONTEND_DEV:
+                    print(f"[DEBUG] Starting frontend on port {FRONTEND_PORT}...")
+                    procs.append(stack.enter_context(start_frontend()))
+            finally:
+                # Pushed after the Popen contexts, so it runs before them: all
+                # servers are signalled in parallel before any Popen.__exit__
+                # waits on its process (even if a later start failed)
+                stack.callback(shutdown_servers)
+            
+            print("[DEBUG] Waiting for servers to start...")
+            local_ip = get_local_ip()
+            # Continue as soon as the servers accept connections, up to 5 seconds
+            deadline = time.monotonic() + 5.0
+            while time.monotonic() < deadline:
+                if (check_port(local_ip, BACKEND_PORT, timeout=0.2, attempts=1) and
+                        (not FRONTEND_DEV or check_port(local_ip, FRONTEND_PORT, timeout=0.2, attempts=1))):
+                    break
+                time.sleep(0.05)
+            
+            # Check if servers are running
+            # Probe both servers side by side so a dead one costs one timeout, not two
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                backend_check = pool.submit(check_port, local_ip, BACKEND_PORT)
+                frontend_check = pool.submit(check_port, local_ip, FRONTEND_PORT)
+                backend_running = backend_check.result()
+                frontend_running = frontend_check.result()
+            
+            print(f"[DEBUG] Backend running: {backend_running}")
+            print(f"[DEBUG] Frontend running: {frontend_running}")
+            
+            if not backend_running:
+                print(f"[ERROR] Backend failed to start on port {BACKEND_PORT}")
+                return 1
+            
+            if not frontend_running:
+                print(f"[WARNING] Frontend may not be running on port {FRONTEND_PORT}")
+                print("[INFO] You may need to manually start the frontend with: cd frontend && npm run dev")
 
-        try:
+            # Open the web GUI in the default browser
+            if frontend_running:
+                webbrowser.open(f"http://{local_ip}:{FRONTEND_PORT}")
+                print(f"Web GUI launched at http://{local_ip}:{FRONTEND_PORT}")
+                print(f"Other computers can access the GUI at: http://{local_ip}:{FRONTEND_PORT}")
+            else:
+                print(f"Backend API available at http://{local_ip}:{BACKEND_PORT}")
+                print(f"Other computers can access the API at: http://{local_ip}:{BACKEND_PORT}")
+
+            # Block until Ctrl+C (or a service manager's SIGTERM) without waking
+            # up in the meantime. The servers run in their own session and
+            # won't see the terminal's SIGHUP, so closing the terminal must
+            # shut them down from here too.
+            shutdown = threading.Event()
+            for signum in (signal.SIGINT, signal.SIGTERM, getattr(signal, 'SIGHUP', None)):
+                if signum is not None:
+                    signal.signal(signum, lambda *_: shutdown.set())
             if args.headless:
                 print("Headless mode not implemented in this version.")
                 print("Please use the web interface or implement headless mode.")
             else:
                 print("Press Ctrl+C to stop the servers")
-            # Wait for interrupt
-            while True:
-                time.sleep(1)
-        except KeyboardInterrupt:
-            print("\nKeyboard interrupt received. Exiting.")
-        finally:
-            print("[DEBUG] Terminating processes...")
-            backend_proc.terminate()
-            if frontend_proc:
-                frontend_proc.terminate()
-            backend_proc.wait()
-            if frontend_proc:
-                frontend_proc.wait()
-            print("All processes terminated. Goodbye!")
-        
-        return 0
-        
+            # Wait for interrupt. Windows can't interrupt a blocking lock
+            # acquire to run the handler, so wake up there once a second.
+            wait_timeout = 1.0 if os.name == 'nt' else None
+            while not shutdown.wait(wait_timeout):
+                pass
+            print("\nShutdown requested. Exiting.")
+            
+            return 0
+            
     finally:
         # Clean up singleton
         if singleton:
@@ -7,12 +7,19 @@ Handles loading and saving of application configuration to JSON files.
 
 import json
 import os
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
 
 
 class ConfigManager:
     """Manages application configuration loading and saving."""
     
+    # Validated fields: (key, type, min, max)
+    _SCHEMA = (
+        ('total_frames', int, 0, 65535),
+        ('frame_rate', int, 1, 120),
+    )
+    
     def __init__(self, config_file: str = "sacn_sender_config.json"):
         """
         Initialize the configuration manager.
@@ -27,23 +34,59 @@ class ConfigManager:
             'universe': 999,
             'frame_length': 512
         }
+        # Parsed file contents keyed by (mtime_ns, size), so repeated loads of
+        # an unchanged file skip the read and JSON parse
+        self._load_cached = lru_cache(maxsize=1)(self._read_config)
+        # Last blob written by save_config() and the file stamp it produced
+        self._last_blob: Optional[bytes] = None
+        self._last_stamp: Optional[Tuple[int, int]] = None
+    
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        """
+        Get the config file's change stamp.
+        
+        Returns:
+            Optional[Tuple[int, int]]: (mtime_ns, size), or None if the file doesn't exist
+        """
+        try:
+            st = os.stat(self.config_file)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+    
+    def _read_config(self, stamp: Tuple[int, int]) -> Dict[str, Any]:
+        """
+        Read and parse the configuration file.
+        
+        Args:
+            stamp (Tuple[int, int]): File (mtime_ns, size); only used as the cache key
+            
+        Returns:
+            Dict[str, Any]: Parsed configuration merged over the defaults
+        """
+        with open(self.config_file, 'r') as f:
+            config = json.load(f)
+            
+        # Merge with defaults to ensure all keys exist
+        merged_config = self.default_config.copy()
+        merged_config.update(config)
+        return merged_config
     
     def load_config(self) -> Dict[str, Any]:
         """
         Load configuration from JSON file.
         
+        The parsed file is cached until it changes on disk or is rewritten
+        through save_config().
+        
         Returns:
             Dict[str, Any]: Configuration dictionary with loaded values or defaults
         """
         try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    config = json.load(f)
-                    
-                # Merge with defaults to ensure all keys exist
-                merged_config = self.default_config.copy()
-                merged_config.update(config)
-                return merged_config
+            stamp = self._file_stamp()
+            if stamp is not None:
+                # Hand out a copy so callers can't mutate the cached entry
+                return self._load_cached(stamp).copy()
                 
         except Exception as e:
             print(f"Error loading configuration: {e}")
@@ -55,6 +98,10 @@ class ConfigManager:
         """
         Save configuration to JSON file.
         
+        The file is written to a temporary path and swapped in with os.replace(),
+        so a crash mid-write never leaves a truncated config. Saving the same
+        content again is skipped while the file is unchanged on disk.
+        
         Args:
             config (Dict[str, Any]): Configuration dictionary to save
             
@@ -62,8 +109,21 @@ class ConfigManager:
             bool: True if save was successful, False otherwise
         """
         try:
-            with open(self.config_file, 'w') as f:
-                json.dump(config, f, indent=2)
+            blob = json.dumps(config, indent=2).encode()
+            if blob == self._last_blob and self._file_stamp() == self._last_stamp:
+                return True
+            
+            tmp_file = self.config_file + '.tmp'
+            with open(tmp_file, 'wb') as f:
+                f.write(blob)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.config_file)
+            
+            # A rewrite within the mtime granularity can keep the same stamp
+            self._load_cached.cache_clear()
+            self._last_blob = blob
+            self._last_stamp = self._file_stamp()
             return True
             
         except Exception as e:
@@ -80,19 +140,8 @@ class ConfigManager:
         Returns:
             bool: True if configuration is valid, False otherwise
         """
-        try:
-            total_frames = config.get('total_frames', 0)
-            frame_rate = config.get('frame_rate', 0)
-            
-            # Validate total frames
-            if not isinstance(total_frames, int) or total_frames < 0 or total_frames > 65535:
-                return False
-                
-            # Validate frame rate
-            if not isinstance(frame_rate, int) or frame_rate <= 0 or frame_rate > 120:
-                return False
-                
-            return True
-            
-        except Exception:
-            return False 
\ No newline at end of file
+        if not isinstance(config, dict):
+            return False
+        # Missing keys count as 0, which is only in range for total_frames
+        return all(isinstance(value := config.get(key, 0), kind) and low <= value <= high
+                   for key, kind, low, high in self._SCHEMA)
@@ -1,3 +1,7 @@
+import sys
+from functools import lru_cache
+
+
 def print_headless_instructions():
     """Print instructions for headless mode keyboard controls."""
     print("\nFrame Conductor (Headless Mode)")
@@ -9,10 +13,30 @@ def print_headless_instructions():
     print("--------------------------------")
 
 
+@lru_cache(maxsize=None)
+def _bars(bar_length):
+    """Every rendered bar for bar_length, indexed by the number of filled cells."""
+    return tuple("=" * filled + ">" + " " * (bar_length - filled - 1)
+                 for filled in range(bar_length + 1))
+
+
+_last_drawn = None
+
+
 def headless_progress_bar(current, total, status, bar_length=30):
-    """Display a real-time progress bar in the terminal for headless mode."""
+    """Display a real-time progress bar in the terminal for headless mode.
+
+    The line is only redrawn when the displayed percentage, status, total or
+    bar length changes (or the run completes), so per-frame calls are cheap.
+    Within one percentage step the frame counter is therefore not updated.
+    """
+    global _last_drawn
     percent = (current / total) if total else 0
-    filled = int(bar_length * percent)
-    bar = "=" * filled + ">" + " " * (bar_length - filled - 1)
     percent_disp = int(percent * 100)
-    print(f"\r[{bar}] {percent_disp:3d}%  (Frame {current}/{total})  Status: {status}   ", end="", flush=True) 
\ No newline at end of file
+    key = (percent_disp, status, total, bar_length, current >= total)
+    if key == _last_drawn:
+        return
+    _last_drawn = key
+    bar = _bars(bar_length)[min(int(bar_length * percent), bar_length)]
+    sys.stdout.write(f"\r[{bar}] {percent_disp:3d}%  (Frame {current}/{total})  Status: {status}   ")
+    sys.stdout.flush()
@@ -3,11 +3,11 @@
 Network Singleton Module for Frame Conductor
 
 This module provides a network-wide singleton mechanism to ensure only one
-instance of Frame Conductor runs per network. It uses UDP broadcasting to
+instance of Frame Conductor runs per network. It uses UDP multicast to
 detect and prevent multiple instances from running simultaneously.
 
 Features:
-    - Network-wide instance detection via UDP broadcasting
+    - Network-wide instance detection via UDP multicast
     - Periodic heartbeat messages to announce presence
     - Graceful handling of multiple instance detection
     - Configurable timeout and port settings
@@ -27,61 +27,132 @@ Usage:
         sys.exit(1)
 """
 
+import functools
+import os
+import random
+import select
+import selectors
 import socket
+import sys
 import threading
 import json
 import time
-from typing import Optional, Callable
+from typing import Optional, Callable, Literal
+
+import orjson
+
+# Multicast group (organization-local scope) the instances talk on. Unlike
+# broadcast, the kernel can keep our own messages from looping back to us.
+MULTICAST_GROUP = "239.255.41.99"
+
+# Instance checks sent at startup, and the spacing between them (seconds)
+CHECK_PROBES = 3
+CHECK_PROBE_SPACING = 0.1
+
+# Longest wait between heartbeat attempts while sending keeps failing
+HEARTBEAT_MAX_BACKOFF = 30.0
+
+
+@functools.lru_cache(maxsize=1)
+def _detect_local_ip() -> str:
+    """
+    Detect the local IP address once per process.
+    
+    Connecting a UDP socket sends nothing; it only makes the OS pick the
+    outgoing interface. Without a default route (offline installs) the
+    address the host name resolves to is used instead.
+    
+    Returns:
+        str: Local IP address, or "localhost" if detection fails
+    """
+    try:
+        # Connect to a remote address to determine local IP
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.connect(("8.8.8.8", 80))
+            return s.getsockname()[0]
+    except OSError:
+        pass
+    try:
+        return socket.gethostbyname(socket.gethostname())
+    except OSError:
+        return "localhost"
 
 
 class NetworkSingleton:
     """
     Network-wide singleton mechanism to ensure only one instance runs per network.
     
-    Uses UDP broadcasting to detect if another instance is already running.
+    Uses UDP multicast to detect if another instance is already running.
     Sends periodic heartbeat messages and listens for other instances.
     
     Attributes:
         port (int): UDP port for singleton communication
         socket (Optional[socket.socket]): UDP socket for communication
         is_running (bool): Whether the singleton mechanism is active
-        heartbeat_thread (Optional[threading.Thread]): Thread for sending heartbeats
-        listener_thread (Optional[threading.Thread]): Thread for listening to messages
+        network_thread (Optional[threading.Thread]): Thread sending heartbeats and handling messages
         local_ip (str): Local IP address of this instance
         instance_id (str): Unique identifier for this instance
-        timeout (int): Timeout for instance detection in seconds
+        timeout (float): Timeout for instance detection in seconds
         heartbeat_interval (int): Interval between heartbeat messages in seconds
         on_conflict_callback (Optional[Callable]): Callback when conflict is detected
+        rcvbuf_bytes (Optional[int]): Requested socket receive buffer size
+        sndbuf_bytes (Optional[int]): Requested socket send buffer size
+        scope (str): "network" for one instance per network, "host" for one per machine
     """
     
     def __init__(self, 
                  port: int = 9001, 
-                 timeout: int = 5, 
+                 timeout: float = 2.0, 
                  heartbeat_interval: int = 2,
-                 on_conflict_callback: Optional[Callable[[str], None]] = None):
+                 on_conflict_callback: Optional[Callable[[str], None]] = None,
+                 rcvbuf_bytes: Optional[int] = None,
+                 sndbuf_bytes: Optional[int] = None,
+                 scope: Literal["network", "host"] = "network"):
         """
         Initialize the network singleton.
         
         Args:
             port (int): UDP port for singleton communication (default: 9001)
-            timeout (int): Timeout for instance detection in seconds (default: 5)
+            timeout (float): Time to wait for other instances to answer, in seconds
+                (default: 2.0; Wi-Fi power saving can delay multicast by a few
+                hundred milliseconds)
             heartbeat_interval (int): Interval between heartbeat messages in seconds (default: 2)
             on_conflict_callback (Optional[Callable]): Callback when conflict is detected
+            rcvbuf_bytes (Optional[int]): Receive buffer size to request, e.g. 4 MB when
+                many instances burst at once (default: None, keep the OS default)
+            sndbuf_bytes (Optional[int]): Send buffer size to request (default: None,
+                keep the OS default)
+            scope (str): "network" (default) detects instances across the network
+                with multicast heartbeats. "host" only guards this machine by
+                holding a local socket name, with no threads or network traffic.
         """
         self.port = port
         self.timeout = timeout
         self.heartbeat_interval = heartbeat_interval
         self.on_conflict_callback = on_conflict_callback
+        self.rcvbuf_bytes = rcvbuf_bytes
+        self.sndbuf_bytes = sndbuf_bytes
+        self.scope = scope
         
         self.socket: Optional[socket.socket] = None
         self.is_running = False
-        self.heartbeat_thread: Optional[threading.Thread] = None
-        self.listener_thread: Optional[threading.Thread] = None
+        self.network_thread: Optional[threading.Thread] = None
+        # Socket pair stop() writes to, waking the network thread out of its select()
+        self._wake_recv: Optional[socket.socket] = None
+        self._wake_send: Optional[socket.socket] = None
         
         # Get local IP and create instance ID
         self.local_ip = self._get_local_ip()
         self.instance_id = f"{self.local_ip}:{self._get_backend_port()}:{self._get_frontend_port()}"
         
+        # Outgoing messages only differ in their timestamp, so everything up
+        # to it is encoded once
+        self._message_prefixes = {
+            message_type: b'{"type": "%s", "instance_id": %s, "timestamp": '
+                          % (message_type.encode(), json.dumps(self.instance_id).encode())
+            for message_type in ("instance_check", "instance_response", "heartbeat")
+        }
+        
     def _get_local_ip(self) -> str:
         """
         Get the local IP address for network access.
@@ -89,13 +160,19 @@ class NetworkSingleton:
         Returns:
             str: Local IP address, or "localhost" if detection fails
         """
-        try:
-            # Connect to a remote address to determine local IP
-            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
-                s.connect(("8.8.8.8", 80))
-                return s.getsockname()[0]
-        except:
-            return "localhost"
+        return _detect_local_ip()
+    
+    def _encode_message(self, message_type: str) -> bytes:
+        """
+        Encode an outgoing message stamped with the current time.
+        
+        Args:
+            message_type (str): "instance_check", "instance_response" or "heartbeat"
+            
+        Returns:
+            bytes: JSON-encoded message
+        """
+        return self._message_prefixes[message_type] + b'%.3f}' % time.time()
     
     def _get_backend_port(self) -> int:
         """Get the backend port number."""
@@ -112,17 +189,37 @@ class NetworkSingleton:
         This method:
         1. Creates and configures the UDP socket
         2. Checks for existing instances on the network
-        3. Starts heartbeat and listener threads if no conflicts detected
+        3. Starts the heartbeat/listener thread if no conflicts detected
+        
+        In host scope it only claims a local socket name instead.
         
         Returns:
             bool: True if no other instance is running, False otherwise
         """
+        if self.scope == "host":
+            return self._start_host_scope()
+        
         try:
             # Create UDP socket
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
             self.socket.bind(('', self.port))
+            # Only ever grow the buffers, and only when asked to, so the OS
+            # default and its autotuning stay in charge otherwise
+            for option, size in ((socket.SO_RCVBUF, self.rcvbuf_bytes), (socket.SO_SNDBUF, self.sndbuf_bytes)):
+                if size and size > self.socket.getsockopt(socket.SOL_SOCKET, option):
+                    self.socket.setsockopt(socket.SOL_SOCKET, option, size)
+            # Keep heartbeats ahead of bulk traffic in the host's queues (Linux only)
+            if hasattr(socket, 'SO_PRIORITY'):
+                try:
+                    self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_PRIORITY, 6)
+                except OSError:
+                    pass
+            self.socket.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP,
+                                   socket.inet_aton(MULTICAST_GROUP) + socket.inet_aton("0.0.0.0"))
+            # Don't deliver our own messages back to us; stay on the local network
+            self.socket.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 0)
+            self.socket.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, 1)
             self.socket.settimeout(1.0)
             
             # Check for existing instances
@@ -131,12 +228,11 @@ class NetworkSingleton:
                     self.on_conflict_callback(self.instance_id)
                 return False
             
-            # Start heartbeat and listener threads
+            # Start the heartbeat/listener thread
+            self._wake_recv, self._wake_send = socket.socketpair()
             self.is_running = True
-            self.heartbeat_thread = threading.Thread(target=self._heartbeat_loop, daemon=True)
-            self.listener_thread = threading.Thread(target=self._listener_loop, daemon=True)
-            self.heartbeat_thread.start()
-            self.listener_thread.start()
+            self.network_thread = threading.Thread(target=self._network_loop, daemon=True)
+            self.network_thread.start()
             
             print(f"[INFO] Network singleton started - this instance: {self.instance_id}")
             return True
@@ -145,16 +241,64 @@ class NetworkSingleton:
             print(f"[ERROR] Failed to start network singleton: {e}")
             return False
     
+    def _start_host_scope(self) -> bool:
+        """
+        Claim this machine by binding a socket name only one process can hold.
+        
+        Linux uses the abstract socket namespace; elsewhere a UDP socket bound
+        exclusively to the loopback port. The OS releases either when the
+        process exits, so a crash never leaves a stale lock behind.
+        
+        Returns:
+            bool: True if no other instance is running on this machine, False otherwise
+        """
+        try:
+            if sys.platform.startswith('linux'):
+                lock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+                address = f'\0frame_conductor_{self.port}'
+            else:
+                lock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                if os.name == 'nt':
+                    lock.setsockopt(socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 1)
+                address = ('127.0.0.1', self.port)
+        except OSError as e:
+            print(f"[ERROR] Failed to start host singleton: {e}")
+            return False
+        
+        try:
+            lock.bind(address)
+        except OSError:
+            lock.close()
+            print(f"[ERROR] Found existing instance on this machine")
+            if self.on_conflict_callback:
+                self.on_conflict_callback(self.instance_id)
+            return False
+        
+        self.socket = lock
+        self.is_running = True
+        print(f"[INFO] Host singleton started - this instance: {self.instance_id}")
+        return True
+    
     def stop(self) -> None:
         """
         Stop the singleton mechanism and clean up resources.
         
         This method:
         1. Sets the running flag to False
-        2. Closes the UDP socket
-        3. Allows threads to terminate naturally
+        2. Wakes the heartbeat/listener thread and waits for it to exit
+        3. Closes the UDP socket
         """
         self.is_running = False
+        if self._wake_send:
+            try:
+                self._wake_send.send(b'\0')
+            except OSError:
+                pass
+            if self.network_thread and self.network_thread is not threading.current_thread():
+                self.network_thread.join(timeout=1.0)
+            self._wake_send.close()
+            self._wake_recv.close()
+            self._wake_send = self._wake_recv = None
         if self.socket:
             try:
                 self.socket.close()
@@ -185,47 +329,45 @@ class NetworkSingleton:
         Check if another instance is already running on the network.
         
         This method:
-        1. Broadcasts an instance check message
-        2. Listens for responses from other instances
-        3. Returns True if another instance is detected
+        1. Multicasts an instance check message a few times, in case one is lost
+        2. Listens for responses from other instances until the timeout
+        3. Returns True as soon as another instance responds
         
         Returns:
             bool: True if another instance is detected, False otherwise
         """
         print(f"[INFO] Checking for existing Frame Conductor instances...")
         
-        # Send broadcast message to check for existing instances
-        check_message = {
-            "type": "instance_check",
-            "instance_id": self.instance_id,
-            "timestamp": time.time()
-        }
-        
         try:
             if not self.socket:
                 return False
-                
-            # Broadcast the check message
-            self.socket.sendto(json.dumps(check_message).encode(), ('<broadcast>', self.port))
             
-            # Listen for responses
-            start_time = time.time()
-            while time.time() - start_time < self.timeout:
+            start_time = time.monotonic()
+            deadline = start_time + self.timeout
+            # Probe times relative to the start; a running instance answers at once
+            probes = [i * CHECK_PROBE_SPACING for i in range(CHECK_PROBES)]
+            while True:
+                now = time.monotonic()
+                while probes and now - start_time >= probes[0]:
+                    probes.pop(0)
+                    self.socket.sendto(self._encode_message("instance_check"), (MULTICAST_GROUP, self.port))
+                if now >= deadline:
+                    break
+                
+                # Listen for responses until the next probe or the deadline
+                wait_until = min(deadline, start_time + probes[0]) if probes else deadline
+                readable, _, _ = select.select([self.socket], [], [], max(0.0, wait_until - now))
+                if not readable:
+                    continue
                 try:
-                    if not self.socket:
-                        break
                     data, addr = self.socket.recvfrom(1024)
-                    if addr[0] != self.local_ip:  # Ignore our own messages
-                        response = json.loads(data.decode())
-                        if response.get("type") == "instance_response":
-                            other_instance = response.get("instance_id", "unknown")
-                            print(f"[ERROR] Found existing instance: {other_instance} at {addr[0]}")
-                            return True
-                except socket.timeout:
-                    continue
+                    response = orjson.loads(data)
+                    if response.get("type") == "instance_response":
+                        other_instance = response.get("instance_id", "unknown")
+                        print(f"[ERROR] Found existing instance: {other_instance} at {addr[0]}")
+                        return True
                 except Exception as e:
                     print(f"[WARNING] Error checking for instances: {e}")
-                    continue
             
             print(f"[INFO] No existing instances found")
             return False
@@ -234,84 +376,108 @@ class NetworkSingleton:
             print(f"[WARNING] Error during instance check: {e}")
             return False
     
-    def _heartbeat_loop(self) -> None:
+    def _network_loop(self) -> None:
         """
-        Send periodic heartbeat messages to announce this instance.
+        Send heartbeats and handle messages from other instances.
         
-        This method runs in a background thread and sends heartbeat messages
-        at regular intervals to announce the presence of this instance.
+        This method runs in a single background thread. It blocks in a
+        selector until a datagram arrives, the next heartbeat is due, or
+        stop() wakes it, so an idle instance only wakes up to heartbeat.
+        Incoming instance checks are answered and heartbeats are logged.
         """
-        while self.is_running:
-            try:
-                if not self.socket:
-                    break
-                heartbeat_message = {
-                    "type": "heartbeat",
-                    "instance_id": self.instance_id,
-                    "timestamp": time.time()
-                }
-                self.socket.sendto(json.dumps(heartbeat_message).encode(), ('<broadcast>', self.port))
-                time.sleep(self.heartbeat_interval)
-            except Exception as e:
-                print(f"[WARNING] Error sending heartbeat: {e}")
-                time.sleep(5)  # Wait longer on error
+        sock = self.socket
+        wake = self._wake_recv
+        if not sock or not wake:
+            return
+        
+        backoff = 0.0
+        next_heartbeat = time.monotonic()
+        with selectors.DefaultSelector() as selector:
+            selector.register(sock, selectors.EVENT_READ)
+            selector.register(wake, selectors.EVENT_READ)
+            while self.is_running:
+                wait = next_heartbeat - time.monotonic()
+                if wait <= 0:
+                    try:
+                        sock.sendto(self._encode_message("heartbeat"), (MULTICAST_GROUP, self.port))
+                        backoff = 0.0
+                        # Jitter by +/-20% so instances started together don't
+                        # keep heartbeating in lockstep
+                        wait = self.heartbeat_interval * random.uniform(0.8, 1.2)
+                    except Exception as e:
+                        if not self.is_running:
+                            return
+                        # Back off exponentially while sending keeps failing
+                        backoff = min(backoff * 2 or self.heartbeat_interval, HEARTBEAT_MAX_BACKOFF)
+                        print(f"[WARNING] Error sending heartbeat (retrying in {backoff:.0f}s): {e}")
+                        wait = backoff
+                    next_heartbeat = time.monotonic() + wait
+                
+                for key, _ in selector.select(wait):
+                    if key.fileobj is wake:
+                        return
+                    try:
+                        data, addr = sock.recvfrom(1024)
+                        self._handle_message(data, addr)
+                    except Exception as e:
+                        if not self.is_running:
+                            return
+                        print(f"[WARNING] Error handling message: {e}")
     
-    def _listener_loop(self) -> None:
+    def _handle_message(self, data: bytes, addr: tuple) -> None:
         """
-        Listen for messages from other instances.
+        Handle one datagram received from another instance.
         
-        This method runs in a background thread and listens for messages
-        from other instances, responding to instance checks and logging heartbeats.
+        Args:
+            data (bytes): Raw message
+            addr (tuple): Sender address
         """
-        while self.is_running:
+        # Heartbeats are the bulk of the traffic and only need the
+        # sender's ID, so pick it out of the bytes without parsing
+        if b'"type": "heartbeat"' in data:
+            other_instance = data.partition(b'"instance_id": "')[2].partition(b'"')[0]
+            print(f"[WARNING] Detected another instance: {other_instance.decode(errors='replace') or 'unknown'} at {addr[0]}")
+            return
+        
+        # Instance checks carry nothing we need beyond their arrival
+        if b'"type": "instance_check"' in data:
+            message_type = "instance_check"
+        else:
             try:
-                if not self.socket:
-                    break
-                data, addr = self.socket.recvfrom(1024)
-                if addr[0] == self.local_ip:  # Ignore our own messages
-                    continue
-                
-                try:
-                    message = json.loads(data.decode())
-                    message_type = message.get("type")
-                    
-                    if message_type == "instance_check":
-                        # Respond to instance check
-                        if self.socket:
-                            response = {
-                                "type": "instance_response",
-                                "instance_id": self.instance_id,
-                                "timestamp": time.time()
-                            }
-                            self.socket.sendto(json.dumps(response).encode(), (addr[0], self.port))
-                        
-                    elif message_type == "heartbeat":
-                        # Log other instance heartbeat
-                        other_instance = message.get("instance_id", "unknown")
-                        print(f"[WARNING] Detected another instance: {other_instance} at {addr[0]}")
-                        
-                except json.JSONDecodeError:
-                    continue
-                    
-            except socket.timeout:
-                continue
-            except Exception as e:
-                print(f"[WARNING] Error in listener loop: {e}")
-                time.sleep(1)
+                message = orjson.loads(data)
+                message_type = message.get("type")
+            except (orjson.JSONDecodeError, AttributeError):
+                return
+        
+        if message_type == "instance_check":
+            # Respond to instance check
+            if self.socket:
+                self.socket.sendto(self._encode_message("instance_response"), (addr[0], self.port))
+            
+        elif message_type == "heartbeat":
+            # Log other instance heartbeat
+            other_instance = message.get("instance_id", "unknown")
+            print(f"[WARNING] Detected another instance: {other_instance} at {addr[0]}")
 
 
 def create_network_singleton(port: int = 9001, 
-                           timeout: int = 5, 
+                           timeout: float = 2.0, 
                            heartbeat_interval: int = 2,
-                           on_conflict_callback: Optional[Callable[[str], None]] = None) -> NetworkSingleton:
+                           on_conflict_callback: Optional[Callable[[str], None]] = None,
+                           rcvbuf_bytes: Optional[int] = None,
+                           sndbuf_bytes: Optional[int] = None,
+                           scope: Literal["network", "host"] = "network") -> NetworkSingleton:
     """
     Factory function to create and configure a network singleton.
     
     Args:
         port (int): UDP port for singleton communication
-        timeout (int): Timeout for instance detection in seconds
+        timeout (float): Timeout for instance detection in seconds
         heartbeat_interval (int): Interval between heartbeat messages in seconds
         on_conflict_callback (Optional[Callable]): Callback when conflict is detected
+        rcvbuf_bytes (Optional[int]): Socket receive buffer size to request
+        sndbuf_bytes (Optional[int]): Socket send buffer size to request
+        scope (str): "network" or "host" singleton scope
         
     Returns:
         NetworkSingleton: Configured network singleton instance
@@ -320,5 +486,8 @@ def create_network_singleton(port: int = 9001,
         port=port,
         timeout=timeout,
         heartbeat_interval=heartbeat_interval,
-        on_conflict_callback=on_conflict_callback
+        on_conflict_callback=on_conflict_callback,
+        rcvbuf_bytes=rcvbuf_bytes,
+        sndbuf_bytes=sndbuf_bytes,
+        scope=scope
     ) 
\ No newline at end of file
@@ -22,7 +22,11 @@ Features:
 Dependencies:
     - sacn: sACN library for DMX over Ethernet communication
     - threading: For background frame transmission
-    - time: For frame timing control
+    - time: For frame timing control (deadline-based pacing)
+
+Raw Mode:
+    SACNSender(use_raw=True) skips the sacn library and sends pre-built E1.31
+    packets over its own UDP socket (see RawE131Output).
 
 Usage:
     sender = SACNSender(universe=999, frame_length=512)
@@ -32,9 +36,15 @@ Usage:
     sender.stop_sending()
 """
 
+import collections
+import logging
+import os
+import socket
+import struct
+import sys
 import threading
 import time
-from typing import Optional, Callable
+from typing import Optional, Callable, Tuple
 
 # Try to import sacn library
 try:
@@ -44,6 +54,141 @@ except ImportError:
     SACN_AVAILABLE = False
     print("Warning: sACN library not available. Install with: pip install sacn")
 
+# The last stretch before each frame deadline is spun rather than slept, since
+# sleep() can overshoot by up to a timer tick (~1 ms even at raised resolution)
+SPIN_TAIL = 0.001
+
+# Windows sleeps in ~15.6 ms timer ticks by default, far too coarse for frame
+# pacing; winmm lets us request 1 ms resolution while the sender is active
+if sys.platform == 'win32':
+    import ctypes
+    _winmm = ctypes.WinDLL('winmm')
+else:
+    _winmm = None
+
+logger = logging.getLogger(__name__)
+
+# GIL switch interval while sending. The sender thread shares the GIL with the
+# web server; after each sleep it may wait this long for the GIL before it can
+# send, so the 5 ms default shows up directly as frame jitter
+SENDER_SWITCH_INTERVAL = 0.001
+
+# E1.31 (sACN) wire constants used by RawE131Output
+E131_PORT = 5568
+E131_HEADER_LEN = 126      # Root + framing + DMP layers, up to and including the start code
+E131_SEQUENCE_OFFSET = 111
+E131_OPTIONS_OFFSET = 112
+E131_STREAM_TERMINATED = 0x40
+E131_KEEPALIVE_INTERVAL = 1.0  # Receivers drop a source after 2.5 s of silence
+E131_TOS = 0xb8  # DSCP EF (expedited forwarding), so switches don't queue frames behind bulk traffic
+
+
+def build_e131_data_packet(cid: bytes, source_name: str, universe: int, slots: int,
+                           priority: int = 100) -> bytearray:
+    """
+    Build an E1.31 data packet with all DMX slots zeroed.
+    
+    Args:
+        cid (bytes): 16-byte component identifier of this source
+        source_name (str): Human-readable source name (max 63 UTF-8 bytes)
+        universe (int): sACN universe (1-63999)
+        slots (int): Number of DMX slots (1-512)
+        priority (int): Source priority (0-200)
+        
+    Returns:
+        bytearray: Complete packet; sequence number and slots can be patched in place
+    """
+    length = E131_HEADER_LEN + slots
+    root = struct.pack('!HH12sHI16s', 0x0010, 0x0000, b'ASC-E1.17\x00\x00\x00',
+                       0x7000 | (length - 16), 0x00000004, cid)
+    framing = struct.pack('!HI64sBHBBH', 0x7000 | (length - 38), 0x00000002,
+                          source_name.encode('utf-8')[:63], priority, 0, 0, 0, universe)
+    dmp = struct.pack('!HBBHHHB', 0x7000 | (length - 115), 0x02, 0xa1, 0x0000, 0x0001, slots + 1, 0x00)
+    return bytearray(root + framing + dmp + bytes(slots))
+
+
+class RawE131Output:
+    """
+    Sends frame numbers for one universe straight over a UDP socket.
+    
+    The E1.31 packet is built once; each frame only patches the sequence
+    number and DMX channels 1 and 2 before a single sendto(). This bypasses
+    the sacn library's per-frame packet rebuild and its background thread,
+    so keep-alives and stream termination are handled here.
+    """
+    
+    def __init__(self, universe: int, frame_length: int, destination: str = '127.0.0.1',
+                 multicast: bool = False, ttl: int = 8, source_name: str = 'Frame Conductor',
+                 sndbuf_bytes: Optional[int] = None):
+        """
+        Initialize the raw output and open its socket.
+        
+        Args:
+            universe (int): sACN universe to send to
+            frame_length (int): DMX frame length in channels
+            destination (str): Unicast destination (ignored when multicast is set)
+            multicast (bool): Send to the universe's multicast group instead
+            ttl (int): Multicast TTL
+            source_name (str): Source name carried in every packet
+            sndbuf_bytes (Optional[int]): Send buffer size to request; only applied
+                when larger than the OS default
+        """
+        self._packet = build_e131_data_packet(os.urandom(16), source_name, universe, frame_length)
+        self._sequence = 0
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        if sndbuf_bytes and sndbuf_bytes > self._sock.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF):
+            self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, sndbuf_bytes)
+        # Mark frames as latency-sensitive, on the wire and (Linux only) in the
+        # host's own queueing. Both are hints; platforms may refuse them.
+        for level, option, value in ((socket.IPPROTO_IP, getattr(socket, 'IP_TOS', None), E131_TOS),
+                                     (socket.SOL_SOCKET, getattr(socket, 'SO_PRIORITY', None), 6)):
+            if option is not None:
+                try:
+                    self._sock.setsockopt(level, option, value)
+                except OSError:
+                    pass
+        if multicast:
+            self._sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, ttl)
+            destination = f"239.255.{universe >> 8}.{universe & 0xFF}"
+        self._address = (destination, E131_PORT)
+        self._last_send = 0.0
+    
+    def send(self) -> None:
+        """Send the current packet with the next sequence number."""
+        packet = self._packet
+        packet[E131_SEQUENCE_OFFSET] = self._sequence
+        self._sequence = (self._sequence + 1) & 0xFF
+        self._sock.sendto(packet, self._address)
+        self._last_send = time.monotonic()
+    
+    def send_frame(self, frame: int) -> None:
+        """
+        Encode a frame number into channels 1 and 2 and send it.
+        
+        Args:
+            frame (int): Frame number (0-65535)
+        """
+        packet = self._packet
+        packet[E131_HEADER_LEN] = (frame >> 8) & 0xFF  # Channel 1: MSB
+        packet[E131_HEADER_LEN + 1] = frame & 0xFF     # Channel 2: LSB
+        self.send()
+    
+    def keep_alive(self) -> None:
+        """Resend the last packet if the stream has been quiet for a keep-alive interval."""
+        if time.monotonic() - self._last_send >= E131_KEEPALIVE_INTERVAL:
+            self.send()
+    
+    def close(self) -> None:
+        """Announce stream termination to receivers and close the socket."""
+        try:
+            self._packet[E131_OPTIONS_OFFSET] |= E131_STREAM_TERMINATED
+            for _ in range(3):
+                self.send()
+        except OSError:
+            pass
+        finally:
+            self._sock.close()
+
 
 class SACNSender:
     """
@@ -64,28 +209,62 @@ class SACNSender:
         frame_rate (int): Frame rate in frames per second
         sender_thread (threading.Thread): Background thread for frame transmission
         frame_callback (Optional[Callable]): Callback function for frame updates
+        dropped_frames (int): Frames skipped this run because the loop fell behind
     """
     
-    def __init__(self, universe: int = 999, frame_length: int = 512):
+    def __init__(self, universe: int = 999, frame_length: int = 512, use_raw: bool = False,
+                 sndbuf_bytes: Optional[int] = None):
         """
         Initialize the sACN sender.
         
         Args:
             universe (int): sACN universe to send to (default: 999)
             frame_length (int): DMX frame length in channels (default: 512)
+            use_raw (bool): Send pre-built E1.31 packets over a plain UDP socket
+                instead of going through the sacn library (default: False)
+            sndbuf_bytes (Optional[int]): Send buffer size to request for the raw
+                output's socket (default: None, keep the OS default)
         """
         self.universe = universe
         self.frame_length = frame_length
+        self.use_raw = use_raw
+        self.sndbuf_bytes = sndbuf_bytes
         self.sender = None
+        self._raw_output: Optional[RawE131Output] = None
+        # Held while start/stop rewrite several state fields, so get_state()
+        # never sees a half-applied transition. The per-frame counter update
+        # in the sender thread stays lock-free.
+        self._state_lock = threading.Lock()
         self.is_running = False
-        self.is_paused = False
+        # Set while frames may flow; the sender thread blocks on it when paused
+        self._run_gate = threading.Event()
+        self._run_gate.set()
+        # Set by stop_sending() to cut short the sender thread's waits
+        self._stop_event = threading.Event()
         self.current_frame = 0
         self.target_frame = 0
         self.frame_rate = 30
+        self.dropped_frames = 0
         self.sender_thread: Optional[threading.Thread] = None
         self.frame_callback: Optional[Callable[[int], None]] = None
+        # Reused DMX frame; only channels 1 and 2 change between frames
+        self._dmx_buf = bytearray(frame_length)
+        self._timer_raised = False
+        self._saved_switch_interval: Optional[float] = None
         self._initialize_sender_once()
 
+    @property
+    def is_paused(self) -> bool:
+        """Whether transmission is paused (backed by the sender thread's run gate)."""
+        return not self._run_gate.is_set()
+
+    @is_paused.setter
+    def is_paused(self, paused: bool) -> None:
+        if paused:
+            self._run_gate.clear()
+        else:
+            self._run_gate.set()
+
     def _initialize_sender_once(self) -> bool:
         """
         Initialize the sACN sender if not already initialized.
@@ -96,19 +275,29 @@ class SACNSender:
         Returns:
             bool: True if initialization was successful, False otherwise
         """
-        if not SACN_AVAILABLE:
-            return False
-        if self.sender is not None:
-            return True
-        try:
-            self.sender = sacn.sACNsender()
-            self.sender.start()
-            self.sender.activate_output(1)
-            return True
-        except Exception as e:
-            print(f"Error initializing sACN sender: {e}")
-            self.sender = None
+        if self.use_raw:
+            if self._raw_output is None:
+                try:
+                    self._raw_output = RawE131Output(self.universe, self.frame_length,
+                                                     sndbuf_bytes=self.sndbuf_bytes)
+                except (OSError, ValueError, struct.error) as e:
+                    print(f"Error initializing raw sACN output: {e}")
+                    return False
+        elif not SACN_AVAILABLE:
             return False
+        elif self.sender is None:
+            try:
+                # The library's thread sends changed data once per tick. Ticking
+                # at twice the frame rate puts every frame on the wire despite
+                # phase drift between the two clocks; unchanged ticks send nothing.
+                self.sender = sacn.sACNsender(fps=2 * self.frame_rate)
+                self.sender.start()
+                self.sender.activate_output(1)
+            except Exception as e:
+                print(f"Error initializing sACN sender: {e}")
+                self.sender = None
+                return False
+        return True
     
     def set_frame_callback(self, callback: Callable[[int], None]) -> None:
         """
@@ -118,6 +307,9 @@ class SACNSender:
         every time a frame is transmitted. This is useful for progress tracking
         and UI updates.
         
+        Callbacks run on a separate dispatcher thread so a slow callback can't
+        delay frames; they may therefore lag the wire by a frame or so.
+        
         Args:
             callback (Callable[[int], None]): Function called with current frame number
         """
@@ -137,19 +329,39 @@ class SACNSender:
         Returns:
             bool: True if starting was successful, False otherwise
         """
+        # A library sender ticking at another rate would drop or delay frames;
+        # replace it unless a run is still using it
+        if (self.sender is not None and self.frame_rate != frame_rate and
+                (self.sender_thread is None or not self.sender_thread.is_alive())):
+            try:
+                self.sender.stop()
+            except Exception as e:
+                print(f"Error stopping sACN sender: {e}")
+            self.sender = None
+            self.frame_rate = frame_rate
+        
         if not self._initialize_sender_once():
             return False
         
-        self.target_frame = target_frame
-        self.frame_rate = frame_rate
-        self.is_running = True
-        self.is_paused = False
-        
-        # Only reset current_frame if not already running
-        if self.sender_thread is None or not self.sender_thread.is_alive():
-            self.current_frame = 0
-            self.sender_thread = threading.Thread(target=self._sender_loop, daemon=True)
-            self.sender_thread.start()
+        with self._state_lock:
+            self.target_frame = target_frame
+            self.frame_rate = frame_rate
+            self.is_running = True
+            self.is_paused = False
+            self._stop_event.clear()
+            
+            # Only reset current_frame if not already running
+            if self.sender_thread is None or not self.sender_thread.is_alive():
+                self.current_frame = 0
+                self.dropped_frames = 0
+                self.sender_thread = threading.Thread(target=self._sender_loop, daemon=True)
+                if self._saved_switch_interval is None:
+                    self._saved_switch_interval = sys.getswitchinterval()
+                    sys.setswitchinterval(min(self._saved_switch_interval, SENDER_SWITCH_INTERVAL))
+                if _winmm is not None and not self._timer_raised:
+                    _winmm.timeBeginPeriod(1)
+                    self._timer_raised = True
+                self.sender_thread.start()
         
         return True
     
@@ -157,10 +369,10 @@ class SACNSender:
         """
         Pause sending sACN frames.
         
-        This method pauses the frame transmission. The sender thread continues
-        running but stops sending frames. Use resume() to continue transmission.
+        This method pauses the frame transmission. The sender thread stays
+        alive but blocks until resume() or stop_sending() is called.
         """
-        self.is_paused = True
+        self._run_gate.clear()
 
     def resume(self) -> None:
         """
@@ -168,7 +380,7 @@ class SACNSender:
         
         This method resumes frame transmission after being paused.
         """
-        self.is_paused = False
+        self._run_gate.set()
 
     def stop_sending(self) -> None:
         """
@@ -177,9 +389,11 @@ class SACNSender:
         This method stops the frame transmission, resets the state, and cleans up
         the sACN sender resources. The sender can be restarted with start_sending().
         """
-        self.is_running = False
-        self.is_paused = False
-        self.current_frame = 0
+        with self._state_lock:
+            self.is_running = False
+            self.is_paused = False  # Also wakes a paused sender thread so it can exit
+            self.current_frame = 0
+            self._stop_event.set()
         
         # Stop sACN sender
         if self.sender:
@@ -189,9 +403,20 @@ class SACNSender:
             except Exception as e:
                 print(f"Error stopping sACN sender: {e}")
         
+        # Restore the interpreter's GIL switch interval and the default Windows
+        # timer resolution right away, even if the thread is slow to exit
+        self._restore_timing()
+        
         # Wait for thread to finish
         if self.sender_thread and self.sender_thread.is_alive():
             self.sender_thread.join(timeout=1.0)
+            # A frame in flight during shutdown may have advanced the counter
+            self.current_frame = 0
+        
+        # Close the raw output once the thread no longer sends on it
+        if self._raw_output is not None:
+            self._raw_output.close()
+            self._raw_output = None
     
     def get_current_frame(self) -> int:
         """
@@ -209,14 +434,51 @@ class SACNSender:
         Returns:
             str: Status string ("Running", "Paused", "Stopped")
         """
-        if not self.is_running:
+        is_running, is_paused, _ = self.get_state()
+        if not is_running:
             return "Stopped"
-        elif self.is_paused:
+        elif is_paused:
             return "Paused"
         else:
             return "Running"
     
+    def get_state(self) -> Tuple[bool, bool, int]:
+        """
+        Get a consistent snapshot of the sender state.
+        
+        Reading is_running, is_paused and current_frame one by one can mix
+        values from before and after a concurrent start or stop.
+        
+        Returns:
+            Tuple[bool, bool, int]: (is_running, is_paused, current_frame)
+        """
+        with self._state_lock:
+            return self.is_running, self.is_paused, self.current_frame
+    
     def _sender_loop(self) -> None:
+        """
+        Body of the sender thread.
+        
+        Runs _send_frames() and then restores the process-wide timing settings
+        raised by start_sending(), however the loop exits, so an early return
+        or crash can't leave the whole interpreter on the sender's settings.
+        """
+        try:
+            self._send_frames()
+        finally:
+            self._restore_timing()
+    
+    def _restore_timing(self) -> None:
+        """Restore the GIL switch interval and Windows timer resolution raised by start_sending()."""
+        with self._state_lock:
+            if self._saved_switch_interval is not None:
+                sys.setswitchinterval(self._saved_switch_interval)
+                self._saved_switch_interval = None
+            if self._timer_raised:
+                _winmm.timeEndPeriod(1)
+                self._timer_raised = False
+    
+    def _send_frames(self) -> None:
         """
         Main loop for sending sACN frames.
         
@@ -226,50 +488,156 @@ class SACNSender:
         """
         frame_interval = 1.0 / self.frame_rate
         
+        # frame_length may have been changed since the last run
+        if len(self._dmx_buf) != self.frame_length:
+            self._dmx_buf = bytearray(self.frame_length)
+        dmx_buf = self._dmx_buf
+        
+        # Resolve the output and callback once; neither changes during a run
+        # (settings updates stop the sender first)
+        raw = self._raw_output
+        lib_sender = self.sender
+        output = None
+        if raw is None:
+            try:
+                output = lib_sender[1]  # type: ignore
+            except Exception as e:
+                print(f"Error accessing sACN output: {e}")
+                return
+        frame_callback = self.frame_callback
+        
+        # Hand frame numbers to the callback through a bounded queue drained
+        # by a dispatcher thread, keeping callback time off the frame clock
+        if frame_callback is not None:
+            callback_queue = collections.deque(maxlen=256)
+            callback_ready = threading.Event()
+            dispatcher = threading.Thread(
+                target=self._dispatch_frame_callbacks,
+                args=(frame_callback, callback_queue, callback_ready),
+                daemon=True
+            )
+            dispatcher.start()
+        
+        run_gate = self._run_gate
+        stop_event = self._stop_event
+        
+        # Set universe (this might be handled differently in some versions)
+        if output is not None:
+            try:
+                output.universe = self.universe
+            except:
+                pass  # Universe might be set differently
+        
+        # Frames are paced against absolute deadlines so send/callback time
+        # doesn't accumulate as drift
+        next_tick = time.perf_counter()
+        
+        # Consecutive send failures; only the first of a streak is logged so a
+        # network outage can't turn the error branch into a log flood
+        failures = 0
+        
         while self.is_running:
-            # Handle pause state
-            if self.is_paused:
-                time.sleep(0.1)
+            # Handle pause state: block until resume() or stop_sending()
+            if not run_gate.is_set():
+                if raw is None:
+                    run_gate.wait()
+                else:
+                    # Nothing else keeps the raw stream alive while paused
+                    while not run_gate.wait(E131_KEEPALIVE_INTERVAL):
+                        raw.keep_alive()
+                next_tick = time.perf_counter()  # Idle time isn't a stall
                 continue
             
             # Check if we've reached the target frame
             if self.current_frame > self.target_frame:
-                time.sleep(0.1)
+                stop_event.wait(0.1)
+                if raw is not None:
+                    raw.keep_alive()
+                next_tick = time.perf_counter()
                 continue
             
             try:
-                # Encode frame number into DMX channels 1 and 2
-                msb = (self.current_frame >> 8) & 0xFF  # Most significant byte
-                lsb = self.current_frame & 0xFF         # Least significant byte
+                if raw is not None:
+                    raw.send_frame(self.current_frame)
+                else:
+                    # Encode frame number into DMX channels 1 and 2; all other
+                    # channels of the reused buffer stay zero
+                    dmx_buf[0] = (self.current_frame >> 8) & 0xFF  # Channel 1: MSB
+                    dmx_buf[1] = self.current_frame & 0xFF         # Channel 2: LSB
+                    
+                    # Hand the frame to the library, whose thread sends it on
+                    # its next tick (it copies the buffer, so reusing it is safe)
+                    output.dmx_data = dmx_buf
                 
-                # Create DMX data (frame_length channels, all zeros except channels 1 and 2)
-                dmx_data = [0] * self.frame_length
-                dmx_data[0] = msb  # Channel 1 (0-indexed)
-                dmx_data[1] = lsb  # Channel 2 (0-indexed)
+                if failures:
+                    logger.info("sACN sending recovered after %d failed attempts", failures)
+                    failures = 0
                 
-                # Send sACN data to the current universe
-                dmx_tuple = tuple(dmx_data)
-                self.sender[1].dmx_data = dmx_tuple  # type: ignore
-                
-                # Set universe (this might be handled differently in some versions)
-                try:
-                    self.sender[1].universe = self.universe  # type: ignore
-                except:
-                    pass  # Universe might be set differently
-                
-                # Call frame callback if set
-                if self.frame_callback:
-                    self.frame_callback(self.current_frame)
+                # Queue the frame for the callback if set
+                if frame_callback is not None:
+                    callback_queue.append(self.current_frame)
+                    callback_ready.set()
                 
                 # Increment frame
                 self.current_frame += 1
                 
-                # Sleep for frame interval
-                time.sleep(frame_interval)
+                next_tick += frame_interval
+                late = time.perf_counter() - next_tick
+                if late >= frame_interval:
+                    # Stalled (GC, scheduling, ...): drop the frames whose
+                    # slots have already passed so frame numbers keep tracking
+                    # wall-clock time instead of bursting to catch up
+                    missed = min(int(late // frame_interval), self.target_frame + 1 - self.current_frame)
+                    self.current_frame += missed
+                    self.dropped_frames += missed
+                    next_tick += missed * frame_interval
+                
+                # Sleep until just before this frame's slot ends, then spin
+                remaining = next_tick - time.perf_counter()
+                if remaining > SPIN_TAIL and stop_event.wait(remaining - SPIN_TAIL):
+                    break
+                while time.perf_counter() < next_tick:
+                    time.sleep(0)  # Yields the GIL while spinning
                 
             except Exception as e:
-                print(f"Error sending frame {self.current_frame}: {e}")
-                time.sleep(0.1)
+                failures += 1
+                if failures == 1:
+                    logger.warning("Error sending frame %s: %s", self.current_frame, e)
+                stop_event.wait(0.1)
+        
+        if frame_callback is not None:
+            # Frames still queued are stale once stopped; let the dispatcher
+            # finish its current callback and exit before this thread does,
+            # so nothing reports progress after stop_sending() returns
+            callback_queue.clear()
+            callback_queue.append(None)
+            callback_ready.set()
+            dispatcher.join(timeout=0.5)
+    
+    def _dispatch_frame_callbacks(self, callback: Callable[[int], None],
+                                  queue: collections.deque, ready: threading.Event) -> None:
+        """
+        Call the frame callback for each queued frame number.
+        
+        Runs in its own thread for the duration of one sender run and exits
+        when it dequeues None.
+        
+        Args:
+            callback (Callable[[int], None]): Frame callback
+            queue (collections.deque): Frame numbers queued by the sender thread
+            ready (threading.Event): Set by the sender thread after queueing
+        """
+        while True:
+            ready.wait()
+            ready.clear()
+            while queue:
+                frame = queue.popleft()
+                if frame is None:
+                    return
+                try:
+                    callback(frame)
+                except Exception as e:
+                    logger.warning("Error in frame callback for frame %s: %s", frame, e)
     
     def is_sacn_available(self) -> bool:
         """